@@ -4,6 +4,7 @@ Handles video capture from OAKD Lite camera or webcam fallback
 """
 import cv2
 import numpy as np
+from datetime import timedelta
 
 # Try to import depthai, but make it optional for laptop testing
 try:
@@ -69,10 +70,14 @@ class Camera:
         self.using_fallback = True
         print("Using fallback webcam")
     
-    def get_frame(self):
+    def get_frame(self, timeout_ms=33):
         """
         Get a frame from the camera
         
+        Args:
+            timeout_ms: How long to wait for the OAKD to deliver a frame
+                        (0 or None returns immediately if none is ready)
+        
         Returns:
             numpy.ndarray: BGR frame, or None if no frame available
         """
@@ -85,7 +90,17 @@ class Camera:
         if self.rgb_queue is None:
             return None
         
-        in_rgb = self.rgb_queue.tryGet()
+        if timeout_ms:
+            # Block on the device queue instead of making callers poll
+            in_rgb = self.rgb_queue.get(timeout=timedelta(milliseconds=timeout_ms))
+            if isinstance(in_rgb, tuple):
+                # DepthAI returns (message, timed_out) when a timeout is given
+                in_rgb, timed_out = in_rgb
+                if timed_out:
+                    in_rgb = None
+        else:
+            in_rgb = self.rgb_queue.tryGet()
+        
         if in_rgb is not None:
             frame = in_rgb.getCvFrame()
             # Convert RGB to BGR for OpenCV
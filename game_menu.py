@@ -28,6 +28,18 @@ class GameMenu:
         self.screen_width = screen_width
         self.screen_height = screen_height
         self.selected_game = GameChoice.NONE
+        
+        # Display buffer reused across frames (callers must not hold on to it)
+        self._display = np.empty((screen_height, screen_width, 3), dtype=np.uint8)
+        self._divider_color = np.array([100, 100, 100], dtype=np.uint8)
+        
+        # Key code -> choice lookup table, indexed by the low byte of the key
+        self._key_lut = [GameChoice.NONE] * 256
+        self._key_lut[ord('1')] = GameChoice.GAME_1
+        self._key_lut[ord('2')] = GameChoice.GAME_2
+        self._key_lut[ord('3')] = GameChoice.GAME_3
+        self._key_lut[ord('r')] = GameChoice.REGISTER
+        self._key_lut[ord('q')] = GameChoice.QUIT
     
     def create_menu_display(self, camera_frame, user_name=None, is_stranger=False):
         """
@@ -41,22 +53,30 @@ class GameMenu:
         Returns:
             numpy.ndarray: Menu display frame
         """
-        # Create blank display
-        display = np.zeros((self.screen_height, self.screen_width, 3), dtype=np.uint8)
-        display.fill(20)  # Dark background
+        display = self._display
         
         # Layout: Camera feed on left, menu on right
         camera_width = int(self.screen_width * 0.5)
         menu_width = self.screen_width - camera_width
         
-        # Resize and place camera frame
+        # Resize the camera frame straight into its slot of the display
         if camera_frame is not None:
-            camera_resized = cv2.resize(camera_frame, (camera_width, self.screen_height))
-            display[:, :camera_width] = camera_resized
+            camera_slot = display[:, :camera_width]
+            resized = cv2.resize(camera_frame, (camera_width, self.screen_height),
+                                 dst=camera_slot)
+            if not np.may_share_memory(resized, camera_slot):
+                # Older OpenCV bindings can't write into a strided view
+                camera_slot[:] = resized
+            display[:, camera_width:].fill(20)  # Dark background
+        else:
+            display.fill(20)
+        
+        # Dividing line as a single two-column store
+        display[:, camera_width:camera_width + 2] = self._divider_color
         
-        # Draw dividing line
-        cv2.line(display, (camera_width, 0), 
-                (camera_width, self.screen_height), (100, 100, 100), 2)
+        # Bind hot-loop lookups to locals once per frame
+        put = cv2.putText
+        font = cv2.FONT_HERSHEY_SIMPLEX
         
         # Draw greeting
         menu_x = camera_width + 20
@@ -69,17 +89,16 @@ class GameMenu:
             greeting = "Hello, Stranger!"
             color = (0, 165, 255)  # Orange for stranger
         
-        cv2.putText(display, greeting, (menu_x, y_offset), 
-                   cv2.FONT_HERSHEY_SIMPLEX, 0.8, color, 2)
+        put(display, greeting, (menu_x, y_offset), font, 0.8, color, 2)
         
         y_offset += 40
         
         if is_stranger:
-            cv2.putText(display, "What game do you want to play?", (menu_x, y_offset), 
-                       cv2.FONT_HERSHEY_SIMPLEX, 0.5, (200, 200, 200), 1)
+            put(display, "What game do you want to play?", (menu_x, y_offset),
+                font, 0.5, (200, 200, 200), 1)
         else:
-            cv2.putText(display, "Select a game to play:", (menu_x, y_offset), 
-                       cv2.FONT_HERSHEY_SIMPLEX, 0.5, (200, 200, 200), 1)
+            put(display, "Select a game to play:", (menu_x, y_offset),
+                font, 0.5, (200, 200, 200), 1)
         
         y_offset += 50
         
@@ -102,21 +121,19 @@ class GameMenu:
             # Game number and name
             text = f"Press '{key}' - {name}"
             text_color = color if self.selected_game == choice else (200, 200, 200)
-            cv2.putText(display, text, (menu_x, y_offset), 
-                       cv2.FONT_HERSHEY_SIMPLEX, 0.6, text_color, 2)
+            put(display, text, (menu_x, y_offset), font, 0.6, text_color, 2)
             y_offset += 40
         
         y_offset += 20
         
         # Registration option
         if is_stranger:
-            cv2.putText(display, "Press 'r' - Register as new user", (menu_x, y_offset), 
-                       cv2.FONT_HERSHEY_SIMPLEX, 0.5, (150, 150, 255), 1)
+            put(display, "Press 'r' - Register as new user", (menu_x, y_offset),
+                font, 0.5, (150, 150, 255), 1)
             y_offset += 30
         
         # Quit option
-        cv2.putText(display, "Press 'q' - Quit", (menu_x, y_offset), 
-                   cv2.FONT_HERSHEY_SIMPLEX, 0.5, (150, 150, 150), 1)
+        put(display, "Press 'q' - Quit", (menu_x, y_offset), font, 0.5, (150, 150, 150), 1)
         
         return display
     
@@ -130,21 +147,11 @@ class GameMenu:
         Returns:
             GameChoice: Selected game choice
         """
-        key_char = chr(key & 0xFF) if key > 0 else None
-        
-        if key_char == '1':
-            self.selected_game = GameChoice.GAME_1
-            return GameChoice.GAME_1
-        elif key_char == '2':
-            self.selected_game = GameChoice.GAME_2
-            return GameChoice.GAME_2
-        elif key_char == '3':
-            self.selected_game = GameChoice.GAME_3
-            return GameChoice.GAME_3
-        elif key_char == 'r':
-            return GameChoice.REGISTER
-        elif key_char == 'q':
-            return GameChoice.QUIT
-        
-        return GameChoice.NONE
-
+        if key <= 0:
+            return GameChoice.NONE
+        
+        choice = self._key_lut[key & 0xFF]
+        if choice in (GameChoice.GAME_1, GameChoice.GAME_2, GameChoice.GAME_3):
+            self.selected_game = choice
+        
+        return choice
@@ -7,10 +7,30 @@ import numpy as np
 import os
 import json
 import pickle
+import functools
 from datetime import datetime
 
+# orjson is optional; it serializes much faster than the json module
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+
+def _dumps_json(obj):
+    """Serialize obj to indented JSON bytes"""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+    return json.dumps(obj, indent=2).encode()
+
 
 class UserRegistration:
+    # Cheap pre-checks that let identify_face skip the cascade on idle frames
+    GATE_SIZE = (80, 60)        # thumbnail used for the checks
+    MOTION_THRESHOLD = 2.0      # mean abs diff vs. previous thumbnail
+    MIN_STDDEV = 5.0            # below this the frame is dark / uniform
+    
     def __init__(self, data_dir=None):
         """
         Initialize user registration system
@@ -29,12 +49,27 @@ class UserRegistration:
         # Create data directory if it doesn't exist
         os.makedirs(data_dir, exist_ok=True)
         
-        # Load existing users
-        self.users = self._load_users()
-        self.face_encodings = self._load_face_encodings()
+        # Users, face encodings and the face detector are loaded on first use
+        # (see the cached properties below), so startup doesn't pay for them
         
-        # Initialize face detector
-        self.face_cascade = cv2.CascadeClassifier(
+        # Thumbnail and result of the last full recognition pass
+        self._last_small = None
+        self._last_result = (None, 0.0, None)
+    
+    @functools.cached_property
+    def users(self):
+        """Registered users, loaded from disk on first access"""
+        return self._load_users()
+    
+    @functools.cached_property
+    def face_encodings(self):
+        """Stored face encodings, loaded from disk on first access"""
+        return self._load_face_encodings()
+    
+    @functools.cached_property
+    def face_cascade(self):
+        """Haar cascade face detector, parsed on first access"""
+        return cv2.CascadeClassifier(
             cv2.data.haarcascades + 'haarcascade_frontalface_default.xml'
         )
     
@@ -47,8 +82,8 @@ class UserRegistration:
     
     def _save_users(self):
         """Save registered users to file"""
-        with open(self.users_file, 'w') as f:
-            json.dump(self.users, f, indent=2)
+        with open(self.users_file, 'wb') as f:
+            f.write(_dumps_json(self.users))
     
     def _load_face_encodings(self):
         """Load face encodings from file"""
@@ -144,21 +179,43 @@ class UserRegistration:
         self._save_users()
         self._save_face_encodings()
         
+        # Registered users changed, so the cached recognition is stale
+        self._last_small = None
+        
         return True
     
-    def recognize_user(self, frame):
+    def identify_face(self, frame):
         """
-        Recognize user from frame
+        Identify the user in frame without drawing anything
         
         Args:
             frame: BGR image frame
             
         Returns:
-            tuple: (user_name, confidence, frame_with_info)
+            tuple: (user_name, confidence, bbox)
                 - user_name: Name of recognized user or None
                 - confidence: Confidence score (0-1)
-                - frame_with_info: Frame with recognition info drawn
+                - bbox: (x, y, w, h) of the detected face, or None if no face
         """
+        # Idle-frame gate: a dark/uniform frame has no face, and a frame that
+        # barely differs from the last one gets the same answer as before
+        small = cv2.resize(frame, self.GATE_SIZE, interpolation=cv2.INTER_AREA)
+        _, stddev = cv2.meanStdDev(small)
+        if stddev.max() < self.MIN_STDDEV:
+            self._last_small = small
+            self._last_result = (None, 0.0, None)
+            return self._last_result
+        if self._last_small is not None:
+            motion = cv2.mean(cv2.absdiff(small, self._last_small))
+            if max(motion[:3]) < self.MOTION_THRESHOLD:
+                return self._last_result
+        self._last_small = small
+        
+        self._last_result = self._identify_face(frame)
+        return self._last_result
+    
+    def _identify_face(self, frame):
+        """Run the cascade and match against registered encodings"""
         gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
         faces = self.face_cascade.detectMultiScale(
             gray,
@@ -167,46 +224,80 @@ class UserRegistration:
             minSize=(100, 100)
         )
         
-        frame_with_info = frame.copy()
+        if len(faces) == 0:
+            return None, 0.0, None
+        
+        # Use first detected face
+        x, y, w, h = faces[0]
+        face_roi = gray[y:y+h, x:x+w]
+        face_roi = cv2.resize(face_roi, (100, 100))
+        face_encoding = face_roi.flatten()
+        
+        # Compare with registered users
+        best_match = None
+        best_score = float('inf')
+        
+        for name, encodings in list(self.face_encodings.items()):
+            for encoding in encodings:
+                # Calculate distance (simplified L2 distance)
+                distance = np.linalg.norm(face_encoding - encoding)
+                if distance < best_score:
+                    best_score = distance
+                    best_match = name
+        
         recognized_name = None
         confidence = 0.0
         
-        if len(faces) > 0:
-            # Use first detected face
-            x, y, w, h = faces[0]
-            face_roi = gray[y:y+h, x:x+w]
-            face_roi = cv2.resize(face_roi, (100, 100))
-            face_encoding = face_roi.flatten()
-            
-            # Compare with registered users
-            best_match = None
-            best_score = float('inf')
-            
-            for name, encodings in self.face_encodings.items():
-                for encoding in encodings:
-                    # Calculate distance (simplified L2 distance)
-                    distance = np.linalg.norm(face_encoding - encoding)
-                    if distance < best_score:
-                        best_score = distance
-                        best_match = name
-            
-            # Threshold for recognition (adjust based on testing)
-            threshold = 5000  # Lower is better match
-            if best_match and best_score < threshold:
-                recognized_name = best_match
-                confidence = max(0, 1 - (best_score / threshold))
-            
-            # Draw recognition info
-            cv2.rectangle(frame_with_info, (x, y), (x+w, y+h), (0, 255, 0), 2)
-            if recognized_name:
-                label = f"{recognized_name} ({confidence:.2f})"
-                color = (0, 255, 0)
-            else:
-                label = "Stranger"
-                color = (0, 0, 255)
+        # Threshold for recognition (adjust based on testing)
+        threshold = 5000  # Lower is better match
+        if best_match and best_score < threshold:
+            recognized_name = best_match
+            confidence = max(0, 1 - (best_score / threshold))
+        
+        return recognized_name, confidence, (int(x), int(y), int(w), int(h))
+    
+    def draw_recognition(self, frame, user_name, confidence, bbox):
+        """
+        Draw recognition info onto frame in place
+        
+        Args:
+            frame: BGR image frame to draw on
+            user_name: Name of recognized user or None
+            confidence: Confidence score (0-1)
+            bbox: (x, y, w, h) of the face, or None to draw nothing
+        """
+        if bbox is None:
+            return
+        
+        x, y, w, h = bbox
+        cv2.rectangle(frame, (x, y), (x+w, y+h), (0, 255, 0), 2)
+        if user_name:
+            label = f"{user_name} ({confidence:.2f})"
+            color = (0, 255, 0)
+        else:
+            label = "Stranger"
+            color = (0, 0, 255)
+        
+        cv2.putText(frame, label, (x, y-10),
+                   cv2.FONT_HERSHEY_SIMPLEX, 0.7, color, 2)
+    
+    def recognize_user(self, frame):
+        """
+        Recognize user from frame
+        
+        Args:
+            frame: BGR image frame
             
-            cv2.putText(frame_with_info, label, (x, y-10),
-                       cv2.FONT_HERSHEY_SIMPLEX, 0.7, color, 2)
+        Returns:
+            tuple: (user_name, confidence, frame_with_info)
+                - user_name: Name of recognized user or None
+                - confidence: Confidence score (0-1)
+                - frame_with_info: Frame with recognition info drawn
+        """
+        recognized_name, confidence, bbox = self.identify_face(frame)
+        
+        frame_with_info = frame.copy()
+        self.draw_recognition(frame_with_info, recognized_name, confidence, bbox)
         
         return recognized_name, confidence, frame_with_info
     
@@ -222,6 +313,7 @@ class UserRegistration:
                 del self.face_encodings[name]
             self._save_users()
             self._save_face_encodings()
+            self._last_small = None
             return True
         return False
 
@@ -6,14 +6,17 @@ import cv2
 import time
 import sys
 import os
+import threading
+
+# Import camera from root directory (before the project directories, which
+# ship their own camera.py, are put in front of it on sys.path)
+from camera import Camera
 
 # Add project directories to path
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'project-1'))
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'project-2'))
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'project-3'))
 
-# Import camera from root directory
-from camera import Camera
 from human_detection.user_registration import UserRegistration
 from game_menu import GameMenu, GameChoice
 from human_detection.registration_ui import RegistrationUI
@@ -21,6 +24,9 @@ from utils import is_gui_available, safe_imshow, safe_waitkey, print_gui_warning
 
 
 class MainMenuSystem:
+    # Recognition runs asynchronously at a few FPS; the UI keeps full frame rate
+    RECOGNITION_INTERVAL = 0.2  # seconds between recognition passes
+    
     def __init__(self):
         """Initialize main menu system"""
         print("=" * 60)
@@ -43,6 +49,17 @@ class MainMenuSystem:
         if not self.gui_available:
             print_gui_warning()
         
+        # Single-slot mailbox between UI thread and recognition thread.
+        # The UI overwrites the slot with its latest frame; the worker takes
+        # whatever is there, so stale frames are dropped rather than queued.
+        self._frame_lock = threading.Lock()
+        self._frame_posted = threading.Event()
+        self._latest_frame = None
+        # (user_name, bbox, confidence, timestamp) published by the worker
+        self._reco_result = (None, None, 0.0, 0.0)
+        self._reco_thread = threading.Thread(target=self._reco_loop, daemon=True)
+        self._reco_thread.start()
+        
         print("Initialization complete!")
         print("\nSystem ready. Looking for users...")
     
@@ -60,6 +77,34 @@ class MainMenuSystem:
         else:
             return None, True, annotated_frame
     
+    def _post_frame(self, frame):
+        """Hand the latest frame to the recognition thread, replacing any unread one"""
+        with self._frame_lock:
+            self._latest_frame = frame
+        self._frame_posted.set()
+    
+    def _reco_loop(self):
+        """Recognition worker: consume posted frames and publish results"""
+        while self.running:
+            if not self._frame_posted.wait(timeout=0.1):
+                continue
+            with self._frame_lock:
+                frame = self._latest_frame
+                self._latest_frame = None
+                self._frame_posted.clear()
+            if frame is None:
+                continue
+            
+            try:
+                user_name, confidence, bbox = self.registration.identify_face(frame)
+            except Exception as e:
+                print(f"Recognition error: {e}")
+                continue
+            
+            # Single tuple assignment is atomic, so readers never see a torn result
+            self._reco_result = (user_name, bbox, confidence, time.monotonic())
+            time.sleep(self.RECOGNITION_INTERVAL)
+    
     def register_new_user(self):
         """Register a new user"""
         print("\n=== User Registration ===")
@@ -87,7 +132,6 @@ class MainMenuSystem:
         while len(samples) < samples_needed:
             frame = self.camera.get_frame()
             if frame is None:
-                time.sleep(0.01)
                 continue
             
             # Flip for mirror effect
@@ -146,26 +190,26 @@ class MainMenuSystem:
         while self.running:
             frame = self.camera.get_frame()
             if frame is None:
-                time.sleep(0.01)
                 continue
             
             # Flip frame for mirror effect
             frame = cv2.flip(frame, 1)
             
-            # Recognize user (check every 30 frames to reduce computation)
-            if int(time.time() * 10) % 30 == 0:  # Check roughly 3 times per second
-                self.current_user, self.is_stranger, annotated_frame = self.recognize_user(frame)
+            # Recognition runs on the worker thread; use its latest result
+            self._post_frame(frame)
+            user_name, bbox, confidence, _ = self._reco_result
+            self.current_user = user_name
+            self.is_stranger = user_name is None
+            
+            # Annotate a copy: the worker may still be reading the posted frame
+            annotated_frame = frame.copy()
+            self.registration.draw_recognition(annotated_frame, user_name, confidence, bbox)
+            if self.current_user:
+                cv2.putText(annotated_frame, f"User: {self.current_user}", 
+                           (10, 30), cv2.FONT_HERSHEY_SIMPLEX, 0.7, (0, 255, 0), 2)
             else:
-                # Use previous recognition result
-                _, _, annotated_frame = self.registration.recognize_user(frame)
-                # Draw current user status
-                if self.current_user:
-                    h, w = annotated_frame.shape[:2]
-                    cv2.putText(annotated_frame, f"User: {self.current_user}", 
-                               (10, 30), cv2.FONT_HERSHEY_SIMPLEX, 0.7, (0, 255, 0), 2)
-                else:
-                    cv2.putText(annotated_frame, "Stranger", 
-                               (10, 30), cv2.FONT_HERSHEY_SIMPLEX, 0.7, (0, 0, 255), 2)
+                cv2.putText(annotated_frame, "Stranger", 
+                           (10, 30), cv2.FONT_HERSHEY_SIMPLEX, 0.7, (0, 0, 255), 2)
             
             # Create menu display
             display = self.menu.create_menu_display(
@@ -240,6 +284,8 @@ class MainMenuSystem:
     def cleanup(self):
         """Clean up resources"""
         print("\nCleaning up...")
+        self.running = False
+        self._reco_thread.join(timeout=1.0)
         self.camera.release()
         if self.gui_available:
             try:
@@ -0,0 +1,13 @@
+"""
+pytest setup for the Phase 1 component tests (test_phase1.py)
+"""
+import pytest
+
+from test_phase1 import check_dependencies
+
+
+@pytest.fixture(scope="session", autouse=True)
+def dependencies():
+    """Skip the session when required dependencies are missing"""
+    if not check_dependencies():
+        pytest.skip("Missing dependencies (see requirements.txt)")
@@ -12,14 +12,15 @@ import numpy as np
 import time
 import os
 import sys
+import select
 import threading
 import queue
 
 # Add parent directory to path for utils and project-1
-parent_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-sys.path.insert(0, parent_dir)
-project1_path = os.path.join(parent_dir, 'project-1')
-sys.path.insert(0, project1_path)
+PARENT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PROJECT1_DIR = os.path.join(PARENT_DIR, 'project-1')
+sys.path.insert(0, PARENT_DIR)
+sys.path.insert(0, PROJECT1_DIR)
 
 from utils import is_gui_available, safe_imshow, safe_waitkey, print_gui_warning
 
@@ -31,19 +32,91 @@ from phase1_person_detector import PersonDetector, PersonDetectorFallback
 from game_logic import RockPaperScissorsGame, GameResult
 from ui_display import GameUI
 
+# MediaPipe gesture detector, also the fallback for the model-based one
+try:
+    from hand_gesture_detector import HandGestureDetector, Gesture
+except ImportError:
+    HandGestureDetector = None
+    Gesture = None
+
 # Try to use model-based detector, fallback to MediaPipe
 try:
     from hand_gesture_detector_model import HandGestureDetectorModel
-    from model_loader import Gesture
+    from model_loader import Gesture, create_session_options, select_providers
     USE_MODEL = True
 except (ImportError, FileNotFoundError):
-    try:
-        from hand_gesture_detector import HandGestureDetector, Gesture
-        USE_MODEL = False
-    except ImportError:
+    USE_MODEL = False
+    if Gesture is None:
         print("Warning: Could not import gesture detector")
-        Gesture = None
-        USE_MODEL = False
+
+# Numba is optional; it compiles the per-frame landmark -> bbox reduction
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+
+if NUMBA_AVAILABLE:
+    @njit(cache=True, fastmath=True)
+    def _landmarks_to_bbox(xy, w, h, pad):
+        """
+        Padded pixel bbox around normalized (x, y) landmarks
+        
+        Args:
+            xy: (N, 2) float32 array of normalized landmark coordinates
+            w: Frame width
+            h: Frame height
+            pad: Padding in pixels
+            
+        Returns:
+            tuple: (x_min, y_min, x_max, y_max), clamped to the frame
+        """
+        nx_min = nx_max = xy[0, 0]
+        ny_min = ny_max = xy[0, 1]
+        for i in range(1, xy.shape[0]):
+            x = xy[i, 0]
+            y = xy[i, 1]
+            if x < nx_min:
+                nx_min = x
+            elif x > nx_max:
+                nx_max = x
+            if y < ny_min:
+                ny_min = y
+            elif y > ny_max:
+                ny_max = y
+        return (max(0, int(nx_min * w) - pad), max(0, int(ny_min * h) - pad),
+                min(w, int(nx_max * w) + pad), min(h, int(ny_max * h) + pad))
+else:
+    def _landmarks_to_bbox(xy, w, h, pad):
+        """
+        Padded pixel bbox around normalized (x, y) landmarks
+        
+        Args:
+            xy: (N, 2) float32 array of normalized landmark coordinates
+            w: Frame width
+            h: Frame height
+            pad: Padding in pixels
+            
+        Returns:
+            tuple: (x_min, y_min, x_max, y_max), clamped to the frame
+        """
+        nx_min, ny_min = xy.min(axis=0)
+        nx_max, ny_max = xy.max(axis=0)
+        return (max(0, int(nx_min * w) - pad), max(0, int(ny_min * h) - pad),
+                min(w, int(nx_max * w) + pad), min(h, int(ny_max * h) + pad))
+
+
+def _put_latest(q, item):
+    """Put item on a size-1 queue, replacing any unread item (newest wins)"""
+    try:
+        q.put_nowait(item)
+    except queue.Full:
+        try:
+            q.get_nowait()
+        except queue.Empty:
+            pass
+        q.put_nowait(item)
 
 
 class SimplePersonDetector:
@@ -51,78 +124,103 @@ class SimplePersonDetector:
     Simple person detector using MediaPipe or basic heuristics
     For Phase 1 demo - can be replaced with full mobilenet-ssd later
     """
+    # MediaPipe Pose resizes to 256x256 internally, so feeding it the full
+    # camera frame only costs a bigger colour conversion and upload. Frames
+    # are scaled (keeping aspect ratio) so the short side is this long.
+    POSE_SHORT_SIDE = 320
+    # Only the bbox is used, so the lite landmark model is accurate enough
+    # and noticeably cheaper than the full one (complexity 1)
+    POSE_MODEL_COMPLEXITY = 0
+    
     def __init__(self):
         """Initialize simple person detector"""
         try:
             import mediapipe as mp
             self.mp_pose = mp.solutions.pose
-            self.pose = self.mp_pose.Pose(
-                static_image_mode=False,
-                model_complexity=1,
-                enable_segmentation=False,
-                min_detection_confidence=0.5
-            )
+            self._pose = None  # Built on first detection, see pose
             self.use_mediapipe = True
             print("Using MediaPipe for person detection")
+            
+            # Compile the bbox helper now rather than on the first detection
+            _landmarks_to_bbox(np.zeros((33, 2), dtype=np.float32), 1, 1, 0)
         except ImportError:
             self.use_mediapipe = False
             print("MediaPipe not available, using basic detection")
         
+        # MediaPipe graphs are not reentrant; serialize process() and close()
+        self._lock = threading.Lock()
+        
+        # Preprocessing buffers, allocated on first use
+        self._small_buf = None
+        self._rgb_buf = None
         self.available = True
     
+    @property
+    def pose(self):
+        """MediaPipe Pose graph, created on first use"""
+        if self._pose is None:
+            self._pose = self.mp_pose.Pose(
+                static_image_mode=False,
+                model_complexity=self.POSE_MODEL_COMPLEXITY,
+                enable_segmentation=False,
+                min_detection_confidence=0.5
+            )
+        return self._pose
+    
     def detect_person(self, frame):
         """
         Detect person in frame
         
         Args:
-            frame: BGR frame
+            frame: BGR frame (not modified)
             
         Returns:
-            tuple: (person_found, person_bbox, annotated_frame)
+            tuple: (person_found, person_bbox, label)
+                - person_bbox: (x_min, y_min, x_max, y_max) or None
+                - label: Text to draw above the bbox, or None
         """
-        annotated_frame = frame.copy()
-        
         if self.use_mediapipe:
-            # Use MediaPipe Pose to detect person
-            rgb_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-            results = self.pose.process(rgb_frame)
+            # Use MediaPipe Pose to detect person on a downscaled copy
+            h, w = frame.shape[:2]
+            scale = self.POSE_SHORT_SIDE / min(h, w)
+            if scale < 1.0:
+                in_w, in_h = round(w * scale), round(h * scale)
+                if self._small_buf is None or self._small_buf.shape[:2] != (in_h, in_w):
+                    self._small_buf = np.empty((in_h, in_w, 3), dtype=np.uint8)
+                small = cv2.resize(frame, (in_w, in_h), dst=self._small_buf,
+                                   interpolation=cv2.INTER_AREA)
+            else:
+                small = frame
+            # Convert into a reused buffer (reallocated only if the shape changes)
+            if self._rgb_buf is None or self._rgb_buf.shape != small.shape:
+                self._rgb_buf = np.empty_like(small)
+            rgb_frame = cv2.cvtColor(small, cv2.COLOR_BGR2RGB, dst=self._rgb_buf)
+            with self._lock:
+                results = self.pose.process(rgb_frame)
             
             if results.pose_landmarks:
-                # Get bounding box from pose landmarks
-                h, w = frame.shape[:2]
+                # Get bounding box from pose landmarks. Landmarks are
+                # normalized, so scaling by the original size maps them
+                # straight back onto the full frame.
                 landmarks = results.pose_landmarks.landmark
                 
-                x_coords = [lm.x * w for lm in landmarks]
-                y_coords = [lm.y * h for lm in landmarks]
-                
-                x_min = int(min(x_coords))
-                x_max = int(max(x_coords))
-                y_min = int(min(y_coords))
-                y_max = int(max(y_coords))
+                # One (N, 2) array of normalized (x, y), reduced to a bbox
+                # with 20 px padding (compiled when Numba is available)
+                pts = np.fromiter((v for lm in landmarks for v in (lm.x, lm.y)),
+                                  dtype=np.float32, count=len(landmarks) * 2).reshape(-1, 2)
+                person_bbox = _landmarks_to_bbox(pts, w, h, 20)
                 
-                # Add padding
-                padding = 20
-                x_min = max(0, x_min - padding)
-                y_min = max(0, y_min - padding)
-                x_max = min(w, x_max + padding)
-                y_max = min(h, y_max + padding)
-                
-                person_bbox = (x_min, y_min, x_max, y_max)
-                
-                # Draw bounding box
-                cv2.rectangle(annotated_frame, (x_min, y_min), (x_max, y_max), (0, 255, 0), 2)
-                cv2.putText(annotated_frame, "Person Detected", (x_min, y_min - 10),
-                           cv2.FONT_HERSHEY_SIMPLEX, 0.6, (0, 255, 0), 2)
-                
-                return True, person_bbox, annotated_frame
+                return True, person_bbox, "Person Detected"
         
         # No person detected
-        return False, None, annotated_frame
+        return False, None, None
     
     def release(self):
         """Release resources"""
-        if hasattr(self, 'pose'):
-            self.pose.close()
+        with self._lock:
+            if getattr(self, '_pose', None) is not None:
+                self._pose.close()
+                self._pose = None
 
 
 class Phase1Demo:
@@ -130,12 +228,34 @@ class Phase1Demo:
     Phase 1 Demo Application
     Combines person detection, distance estimation, and RPS game
     """
-    def __init__(self):
-        """Initialize Phase 1 demo"""
+    def __init__(self, use_opencl=False):
+        """
+        Initialize Phase 1 demo
+        
+        Args:
+            use_opencl: Annotate detection-mode frames through cv2.UMat so
+                        OpenCV can run the draws on an OpenCL device. Off by
+                        default: for a rectangle and a few lines of text the
+                        upload/download usually costs more than it saves.
+        """
         print("=" * 60)
         print("Phase 1: OAK-D Desktop Demo")
         print("=" * 60)
         
+        # Split the cores between OpenCV's thread pool and model inference
+        # so the two do not fight over the same CPUs
+        n_cpu = os.cpu_count() or 1
+        self._cv_threads = max(1, n_cpu // 2)
+        self._inference_threads = max(1, n_cpu - self._cv_threads)
+        cv2.setNumThreads(self._cv_threads)
+        print(f"OpenCV threads: {cv2.getNumThreads()}")
+        self._use_opencl = use_opencl and cv2.ocl.haveOpenCL()
+        if self._use_opencl:
+            cv2.ocl.setUseOpenCL(True)
+            print("OpenCL annotation: enabled")
+        elif use_opencl:
+            print("OpenCL annotation: not available, drawing on the CPU")
+        
         # Initialize camera with depth support
         print("\n[1/3] Initializing OAK-D camera with depth...")
         self.camera = Phase1OAKDCamera()
@@ -166,21 +286,24 @@ class Phase1Demo:
         # Initialize gesture detector
         try:
             # Try to find model in project-1 directory
-            model_path = os.path.join(project1_path, 'rps_model_improved.pth')
-            if not os.path.exists(model_path):
-                model_path = None
+            model_path = os.path.join(PROJECT1_DIR, 'rps_model_improved.pth')
             
-            if USE_MODEL and model_path and os.path.exists(model_path):
+            self.gesture_detector = None
+            if USE_MODEL and os.path.exists(model_path):
                 try:
-                    self.gesture_detector = HandGestureDetectorModel(model_path=model_path)
+                    # One set of ONNX Runtime options shared by every session;
+                    # inference moves to the GPU when one is available
+                    self._ort_opts = create_session_options(self._inference_threads)
+                    self._ort_providers = select_providers()
+                    self.gesture_detector = HandGestureDetectorModel(
+                        model_path=model_path, sess_options=self._ort_opts,
+                        providers=self._ort_providers)
                     print("Using trained PyTorch model for gesture detection")
                 except Exception as e:
                     print(f"Failed to load model: {e}")
                     print("Falling back to MediaPipe...")
-                    from hand_gesture_detector import HandGestureDetector
-                    self.gesture_detector = HandGestureDetector()
-            else:
-                from hand_gesture_detector import HandGestureDetector
+            
+            if self.gesture_detector is None:
                 self.gesture_detector = HandGestureDetector()
                 print("Using MediaPipe for gesture detection")
         except Exception as e:
@@ -221,11 +344,77 @@ class Phase1Demo:
         self.distance_to_person = None
         self.last_rps_result = None
         
+        # Rendered detection-mode HUD tiles, keyed by (mode, person_found, shape)
+        self._hud_cache = {}
+        
+        # Interaction-mode banner shown while nobody is in view (constant)
+        self._no_person_text = "No person detected - Show yourself to play!"
+        self._no_person_text_size = cv2.getTextSize(
+            self._no_person_text, cv2.FONT_HERSHEY_SIMPLEX, 0.7, 2)[0]
+        
+        # Person detection stride (RPS still runs every frame)
+        self._det_stride = 2
+        self._det_counter = 0
+        self._last_detection = (False, None, None)  # (found, bbox, label)
+        
+        # Motion gate: while an 80x60 grayscale thumbnail barely changes, the
+        # last detection is reused for up to _det_max_age frames
+        self._motion_threshold = 2.0  # mean absolute difference (0-255)
+        self._det_max_age = 10
+        self._det_age = 0
+        self._thumb = np.empty((60, 80, 3), dtype=np.uint8)
+        self._thumb_gray = np.empty((60, 80), dtype=np.uint8)
+        self._thumb_ref = None  # thumbnail at the last detection
+        
+        # In interaction mode the distance is only a readout, so depth is
+        # fetched only once the last measurement is older than this
+        self.depth_max_age = 0.5  # seconds
+        self._last_depth_ts = 0.0
+        
         # RPS game state (using project-1 style)
-        self.current_player_gesture = Gesture.NONE if Gesture else None
+        self._gesture_none = Gesture.NONE if Gesture else None  # bound once for the hot path
+        self.current_player_gesture = self._gesture_none
         self.gesture_hold_time = 0
         self.gesture_hold_threshold = 30  # Frames to hold gesture before playing
         
+        # Capture -> detection -> display pipeline. Each stage runs on its own
+        # thread; the size-1 queue keeps only the newest item so a slow stage
+        # drops stale frames instead of building up latency.
+        self.frame_q = queue.Queue(maxsize=1)   # (frame, depth_frame)
+        self.stop_evt = threading.Event()
+        self._state_lock = threading.Lock()     # game state shared with detection
+        self._capture_thread = None
+        self._detect_thread = None
+        self._display_thread = None
+        self._status_thread = None
+        
+        # Triple-buffered handoff from the detection thread (producer) to the
+        # display thread (consumer). Only slot indices are swapped, under
+        # _disp_lock; the producer always draws into the write slot, which is
+        # never the one on screen.
+        self._disp = [None, None, None]       # frame published in each slot
+        self._disp_bufs = [None, None, None]  # detection-mode render targets
+        self._ui_canvases = [None, None, None]  # interaction-mode GameUI canvases
+        self._disp_write, self._disp_ready, self._disp_show = 0, 1, 2
+        self._disp_fresh = False
+        self._disp_lock = threading.Lock()
+        self._disp_evt = threading.Event()
+        self.key_q = queue.Queue()            # key codes from the display thread
+        
+        # Control actions by OpenCV key code and by terminal command
+        self._keymap = {
+            ord('q'): "quit",
+            ord('i'): "interaction",
+            ord('d'): "detection",
+            ord('r'): "reset",
+        }
+        self._commands = {
+            'q': "quit", 'quit': "quit", 'exit': "quit",
+            'i': "interaction", 'interaction': "interaction", 'interact': "interaction",
+            'd': "detection", 'detection': "detection", 'detect': "detection",
+            'r': "reset", 'reset': "reset",
+        }
+        
         # Terminal input handling
         self.terminal_input_queue = queue.Queue()
         self.terminal_input_thread = None
@@ -243,48 +432,183 @@ class Phase1Demo:
         print("Starting demo...\n")
     
     def run(self):
-        """Main demo loop"""
-        frame_count = 0
+        """Main demo loop: show processed frames and handle input"""
+        self._capture_thread = threading.Thread(target=self._capture_loop, daemon=True)
+        self._detect_thread = threading.Thread(target=self._detect_loop, daemon=True)
+        self._display_thread = threading.Thread(target=self._display_loop, daemon=True)
+        self._status_thread = threading.Thread(target=self._status_printer, daemon=True)
+        self._capture_thread.start()
+        self._detect_thread.start()
+        self._display_thread.start()
+        self._status_thread.start()
         
         while self.running:
-            # Get frame from camera
-            frame = self.camera.get_frame()
+            # Handle keyboard input forwarded by the display thread
+            try:
+                key = self.key_q.get(timeout=0.1)
+                while True:
+                    self._apply_action(self._keymap[key])
+                    key = self.key_q.get_nowait()
+            except queue.Empty:
+                pass
+            
+            # Handle terminal input (non-blocking)
+            try:
+                while True:
+                    command = self.terminal_input_queue.get_nowait().strip().lower()
+                    action = self._commands.get(command)
+                    if action == "quit":
+                        print("\n>>> Quitting...")
+                    if action:
+                        self._apply_action(action)
+                    elif command:
+                        print(f"Unknown command: {command}. Type 'q' to quit, 'i' for interaction, 'd' for detection, 'r' to reset")
+            except queue.Empty:
+                pass  # No terminal input available
+        
+        self.stop_evt.set()
+        print("\nDemo ended.")
+    
+    def _apply_action(self, action):
+        """Apply a control action from the keyboard or the terminal"""
+        if action == "quit":
+            self.running = False
+        elif action == "interaction":
+            self.mode = "interaction"
+            print("\n>>> Switched to INTERACTION mode (RPS game)")
+            print("    Show your hand gesture to play!")
+        elif action == "detection":
+            self.mode = "detection"
+            print("\n>>> Switched to DETECTION mode (person + distance)")
+        elif action == "reset":
+            with self._state_lock:
+                self.game.reset_game()
+            print("\n>>> RPS game reset!")
+    
+    def _capture_loop(self):
+        """Capture thread: read RGB + depth frames and hand the newest to detection"""
+        while not self.stop_evt.is_set():
+            # Blocks until the OAK-D delivers a frame (or 100 ms pass)
+            frame = self.camera.get_frame(timeout_ms=100)
             if frame is None:
-                time.sleep(0.01)
+                # The webcam fallback blocks in read() itself; only back off
+                # when it is failing, so a lost camera does not spin the thread
+                if self.camera.using_fallback:
+                    self.stop_evt.wait(0.01)
                 continue
             
-            # Get depth frame
-            depth_frame = self.camera.get_depth_frame()
-            
-            # Create display frame
-            display_frame = frame.copy()
+            if (self.mode == "detection" or
+                    time.time() - self._last_depth_ts > self.depth_max_age):
+                depth_frame = self.camera.get_depth_frame()
+            else:
+                depth_frame = None
+            _put_latest(self.frame_q, (frame, depth_frame))
+    
+    def _detect_loop(self):
+        """Detection thread: run detection / RPS on the newest frame and publish it"""
+        while not self.stop_evt.is_set():
+            try:
+                frame, depth_frame = self.frame_q.get(timeout=0.1)
+            except queue.Empty:
+                continue
             
-            # Person detection
-            person_found, person_bbox, detected_frame = self.person_detector.detect_person(frame)
-            self.person_found = person_found
-            self.person_bbox = person_bbox
+            try:
+                with self._state_lock:
+                    display_frame = self._process_frame(frame, depth_frame)
+            except Exception as e:
+                print(f"\nError in detection thread: {e}")
+                import traceback
+                traceback.print_exc()
+                self.running = False
+                break
             
-            # Update display with person detection
-            if person_found and person_bbox:
-                display_frame = detected_frame
-                
-                # Calculate distance
-                if depth_frame is not None:
-                    self.distance_to_person = self.camera.get_distance_from_bbox(
-                        person_bbox, depth_frame
-                    )
-                else:
-                    self.distance_to_person = None
+            self._publish_display(display_frame)
+    
+    def _publish_display(self, display_frame):
+        """Hand a finished frame to the display thread (swap write <-> ready)"""
+        with self._disp_lock:
+            self._disp[self._disp_write] = display_frame
+            self._disp_write, self._disp_ready = self._disp_ready, self._disp_write
+            self._disp_fresh = True
+        self._disp_evt.set()
+    
+    def _display_loop(self):
+        """
+        Display thread: show the newest published frame and forward key presses
+        
+        All OpenCV GUI calls (window creation, imshow, waitKey, teardown) stay
+        on this thread, so a slow window system never stalls detection.
+        """
+        window_name = "Phase 1: OAK-D Demo"
+        while not self.stop_evt.is_set():
+            if self._disp_evt.wait(0.03):
+                self._disp_evt.clear()
+                with self._disp_lock:
+                    if self._disp_fresh:
+                        self._disp_show, self._disp_ready = self._disp_ready, self._disp_show
+                        self._disp_fresh = False
                 
-                # Draw distance info
-                if self.distance_to_person is not None:
-                    x_min, y_min, x_max, y_max = person_bbox
-                    distance_text = f"Distance: {self.distance_to_person:.2f}m"
-                    cv2.putText(display_frame, distance_text, (x_min, y_max + 25),
-                               cv2.FONT_HERSHEY_SIMPLEX, 0.7, (0, 255, 255), 2)
+                # Show display (will output to XQuartz if DISPLAY is set)
+                display_frame = self._disp[self._disp_show]
+                if display_frame is not None and self.gui_available:
+                    safe_imshow(window_name, display_frame)
             
-            # Mode-specific processing
-            if self.mode == "interaction":
+            # Pump GUI events and pass control keys to the main thread
+            key = safe_waitkey(1)
+            if key in self._keymap:
+                self.key_q.put(key)
+        
+        if self.gui_available:
+            try:
+                cv2.destroyAllWindows()
+            except:
+                pass
+    
+    def _process_frame(self, frame, depth_frame):
+        """
+        Run person detection, distance estimation and (in interaction mode)
+        the RPS game on one frame
+        
+        Args:
+            frame: BGR frame
+            depth_frame: Depth frame aligned with frame, or None
+            
+        Returns:
+            numpy.ndarray: Frame to display, or None when there is no GUI
+        """
+        # Nothing is drawn when the frame would never be shown; detection,
+        # distance and the game still run for the terminal status
+        display_frame = None
+        
+        # Person detection (the detector only reports; all drawing happens here).
+        # The person moves slowly relative to the frame rate, so the detector
+        # only runs every _det_stride frames and the bbox is reused in between.
+        # A static scene also skips detection, until the result gets too old.
+        if self._det_counter % self._det_stride == 0 and self._scene_changed(frame):
+            self._last_detection = self.person_detector.detect_person(frame)
+            self._det_age = 0
+        else:
+            self._det_age += 1
+        self._det_counter += 1
+        person_found, person_bbox, person_label = self._last_detection
+        self.person_found = person_found
+        self.person_bbox = person_bbox
+        
+        # Calculate distance (keep the last one while it is still fresh)
+        if person_found and person_bbox:
+            if depth_frame is not None:
+                # Centered 40% of the box: skips the background around the
+                # person's outline
+                self.distance_to_person = self.camera.get_distance_from_bbox(
+                    person_bbox, depth_frame, roi_frac=0.4
+                )
+                self._last_depth_ts = time.time()
+            elif time.time() - self._last_depth_ts > self.depth_max_age:
+                self.distance_to_person = None
+        
+        # Mode-specific processing
+        if self.mode == "interaction":
+            if person_found:
                 # Detect gesture using project-1 gesture detector (use original frame)
                 result = self.gesture_detector.detect_gesture(frame)
                 
@@ -301,57 +625,51 @@ class Phase1Demo:
                 else:
                     gesture = result
                     camera_frame_for_ui = frame
-                
-                # Update current gesture
-                if gesture != Gesture.NONE:
-                    if gesture == self.current_player_gesture:
-                        self.gesture_hold_time += 1
-                    else:
-                        self.current_player_gesture = gesture
-                        self.gesture_hold_time = 1
+            else:
+                # Nobody to play against, skip the gesture inference
+                gesture = self._gesture_none
+                camera_frame_for_ui = frame
+            
+            # Update current gesture
+            gesture_none = self._gesture_none
+            if gesture != gesture_none:
+                if gesture == self.current_player_gesture:
+                    self.gesture_hold_time += 1
                 else:
-                    self.current_player_gesture = Gesture.NONE
-                    self.gesture_hold_time = 0
-                
-                # Play round if gesture held long enough (only if person detected)
-                if person_found and (self.gesture_hold_time >= self.gesture_hold_threshold and 
-                    self.current_player_gesture != Gesture.NONE and
-                    self.game.result is None):
-                    # Play the round
-                    self.last_rps_result = self.game.play_round(self.current_player_gesture)
-                    if self.last_rps_result is not None:
-                        print(f"Round {self.game.round_count}: "
-                              f"Player: {self.current_player_gesture.value}, "
-                              f"AI: {self.game.ai_choice.value}, "
-                              f"Result: {self.last_rps_result.value}")
-                
-                # Reset round after showing result for a while
-                if self.last_rps_result and self.gesture_hold_time < 10:
-                    # Reset for next round
-                    self.game.reset_round()
-                    self.last_rps_result = None
-                
+                    self.current_player_gesture = gesture
+                    self.gesture_hold_time = 1
+            else:
+                self.current_player_gesture = gesture_none
+                self.gesture_hold_time = 0
+            
+            # Play round if gesture held long enough (only if person detected)
+            if person_found and (self.gesture_hold_time >= self.gesture_hold_threshold and 
+                self.current_player_gesture != gesture_none and
+                self.game.result is None):
+                # Play the round
+                self.last_rps_result = self.game.play_round(self.current_player_gesture)
+                if self.last_rps_result is not None:
+                    print(f"Round {self.game.round_count}: "
+                          f"Player: {self.current_player_gesture.value}, "
+                          f"AI: {self.game.ai_choice.value}, "
+                          f"Result: {self.last_rps_result.value}")
+            
+            # Reset round after showing result for a while
+            if self.last_rps_result and self.gesture_hold_time < 10:
+                # Reset for next round
+                self.game.reset_round()
+                self.last_rps_result = None
+            
+            if self.gui_available:
                 # Add person detection overlay to camera frame if person found
                 if person_found and person_bbox:
-                    # Draw person bbox on camera frame
-                    x_min, y_min, x_max, y_max = person_bbox
-                    cv2.rectangle(camera_frame_for_ui, (x_min, y_min), (x_max, y_max), (0, 255, 0), 2)
-                    cv2.putText(camera_frame_for_ui, "Person Detected", (x_min, y_min - 10),
-                               cv2.FONT_HERSHEY_SIMPLEX, 0.6, (0, 255, 0), 2)
-                    
-                    # Draw distance if available
-                    if self.distance_to_person is not None:
-                        distance_text = f"Distance: {self.distance_to_person:.2f}m"
-                        cv2.putText(camera_frame_for_ui, distance_text, (x_min, y_max + 25),
-                                   cv2.FONT_HERSHEY_SIMPLEX, 0.7, (0, 255, 255), 2)
+                    self._draw_person(camera_frame_for_ui, person_bbox, person_label)
                 else:
                     # Draw "No person detected" message
                     h, w = camera_frame_for_ui.shape[:2]
-                    text = "No person detected - Show yourself to play!"
-                    text_size = cv2.getTextSize(text, cv2.FONT_HERSHEY_SIMPLEX, 0.7, 2)[0]
-                    text_x = (w - text_size[0]) // 2
+                    text_x = (w - self._no_person_text_size[0]) // 2
                     text_y = h // 2
-                    cv2.putText(camera_frame_for_ui, text, (text_x, text_y),
+                    cv2.putText(camera_frame_for_ui, self._no_person_text, (text_x, text_y),
                                cv2.FONT_HERSHEY_SIMPLEX, 0.7, (0, 0, 255), 2)
                 
                 # Use project-1 UI to create display (always use original frame dimensions)
@@ -362,94 +680,208 @@ class Phase1Demo:
                     game_result=self.last_rps_result,
                     player_score=self.game.player_score,
                     ai_score=self.game.ai_score,
-                    round_count=self.game.round_count
+                    round_count=self.game.round_count,
+                    canvas=self._next_ui_canvas()
                 )
-            else:
-                # Detection mode - draw overlays on camera frame
-                # Draw mode indicator
-                mode_text = f"Mode: {self.mode.upper()}"
-                if self.mode == "interaction":
-                    mode_color = (0, 255, 0)
-                else:
-                    mode_color = (255, 255, 0)
-                
-                cv2.putText(display_frame, mode_text, (10, 30),
-                           cv2.FONT_HERSHEY_SIMPLEX, 0.7, mode_color, 2)
-                
-                # Draw person status
-                if person_found:
-                    status_text = "Person: DETECTED"
-                    status_color = (0, 255, 0)
-                else:
-                    status_text = "Person: NOT DETECTED"
-                    status_color = (0, 0, 255)
-                
-                cv2.putText(display_frame, status_text, (10, 90),
-                           cv2.FONT_HERSHEY_SIMPLEX, 0.7, status_color, 2)
-            
-            # Show display (will output to XQuartz if DISPLAY is set)
-            if self.gui_available:
-                safe_imshow("Phase 1: OAK-D Demo", display_frame)
-            
-            # Print status to terminal
-            if frame_count % 30 == 0:  # Print every 30 frames
-                self._print_status()
+        elif self.gui_available and self._use_opencl:
+            # Detection mode - draw on the device copy, download once at the end
+            u_frame = cv2.UMat(frame)
+            if person_found and person_bbox:
+                self._draw_person(u_frame, person_bbox, person_label)
+            self._blit_hud_umat(u_frame, frame.shape, person_found)
+            display_frame = u_frame.get()
+        elif self.gui_available:
+            # Detection mode - draw on a copy in a reused buffer
+            display_frame = self._next_display_buffer(frame)
+            if person_found and person_bbox:
+                self._draw_person(display_frame, person_bbox, person_label)
             
-            # Handle keyboard input from OpenCV window
-            key = safe_waitkey(1)
-            if key != -1:
-                if key == ord('q'):
-                    self.running = False
-                elif key == ord('i'):
-                    self.mode = "interaction"
-                    print("\n>>> Switched to INTERACTION mode (RPS game)")
-                    print("    Show your hand gesture to play!")
-                elif key == ord('d'):
-                    self.mode = "detection"
-                    print("\n>>> Switched to DETECTION mode (person + distance)")
-                elif key == ord('r'):
-                    self.game.reset_game()
-                    print("\n>>> RPS game reset!")
+            # The mode / person-status text only changes with state, so it
+            # is rasterized once per state and blitted
+            self._blit_hud(display_frame, person_found)
+        
+        return display_frame
+    
+    def _scene_changed(self, frame):
+        """
+        Whether person detection should run again on this frame
+        
+        Compares an 80x60 grayscale thumbnail with the one from the last
+        detection; the reference is updated when this returns True.
+        
+        Args:
+            frame: BGR frame
             
-            # Handle terminal input (non-blocking)
-            try:
-                while True:
-                    command = self.terminal_input_queue.get_nowait().strip().lower()
-                    if command in ['q', 'quit', 'exit']:
-                        self.running = False
-                        print("\n>>> Quitting...")
-                    elif command in ['i', 'interaction', 'interact']:
-                        self.mode = "interaction"
-                        print("\n>>> Switched to INTERACTION mode (RPS game)")
-                        print("    Show your hand gesture to play!")
-                    elif command in ['d', 'detection', 'detect']:
-                        self.mode = "detection"
-                        print("\n>>> Switched to DETECTION mode (person + distance)")
-                    elif command in ['r', 'reset']:
-                        self.game.reset_game()
-                        print("\n>>> RPS game reset!")
-                    elif command:
-                        print(f"Unknown command: {command}. Type 'q' to quit, 'i' for interaction, 'd' for detection, 'r' to reset")
-            except queue.Empty:
-                pass  # No terminal input available
+        Returns:
+            bool: True if the scene moved or the last detection is too old
+        """
+        # Bilinear is coarse at 8x, but ~20x cheaper than INTER_AREA and noise
+        # only makes detection run more often
+        cv2.resize(frame, (80, 60), dst=self._thumb, interpolation=cv2.INTER_LINEAR)
+        cv2.cvtColor(self._thumb, cv2.COLOR_BGR2GRAY, dst=self._thumb_gray)
+        
+        if (self._thumb_ref is None or self._det_age >= self._det_max_age or
+                cv2.norm(self._thumb_gray, self._thumb_ref, cv2.NORM_L1)
+                > self._motion_threshold * self._thumb_gray.size):
+            if self._thumb_ref is None:
+                self._thumb_ref = self._thumb_gray.copy()
+            else:
+                np.copyto(self._thumb_ref, self._thumb_gray)
+            return True
+        return False
+    
+    def _next_display_buffer(self, frame):
+        """
+        Copy frame into the render target of the current write slot
+        
+        Args:
+            frame: BGR frame
             
-            frame_count += 1
+        Returns:
+            numpy.ndarray: Buffer holding a copy of frame
+        """
+        # Only this (detection) thread moves the write index
+        slot = self._disp_write
+        buf = self._disp_bufs[slot]
+        if buf is None or buf.shape != frame.shape:
+            buf = np.empty_like(frame)
+            self._disp_bufs[slot] = buf
         
-        print("\nDemo ended.")
+        np.copyto(buf, frame)
+        return buf
+    
+    def _next_ui_canvas(self):
+        """
+        GameUI canvas for the current write slot
+        
+        Returns:
+            numpy.ndarray: Preallocated (height, width, 3) uint8 buffer
+        """
+        slot = self._disp_write
+        canvas = self._ui_canvases[slot]
+        if canvas is None:
+            canvas = np.empty((self.ui.screen_height, self.ui.screen_width, 3), dtype=np.uint8)
+            self._ui_canvases[slot] = canvas
+        return canvas
+    
+    def _blit_hud(self, image, person_found):
+        """Copy the cached detection-mode HUD onto image in place"""
+        tile, mask = self._get_hud(image.shape, person_found)
+        th, tw = tile.shape[:2]
+        np.copyto(image[:th, :tw], tile, where=mask)
+    
+    def _blit_hud_umat(self, u_image, shape, person_found):
+        """Copy the cached detection-mode HUD onto a cv2.UMat in place"""
+        tile, mask = self._get_hud(shape, person_found)
+        th, tw = tile.shape[:2]
+        roi = cv2.UMat(u_image, (0, th), (0, tw))
+        cv2.copyTo(tile, mask.view(np.uint8), roi)
+    
+    def _get_hud(self, shape, person_found):
+        """Cached (tile, mask) HUD for the current mode and person state"""
+        key = (self.mode, person_found, shape)
+        hud = self._hud_cache.get(key)
+        if hud is None:
+            hud = self._render_hud(shape, person_found)
+            self._hud_cache[key] = hud
+        return hud
+    
+    def _render_hud(self, shape, person_found):
+        """Rasterize the detection-mode HUD text into a (tile, mask) pair"""
+        # Draw mode indicator
+        mode_text = f"Mode: {self.mode.upper()}"
+        if self.mode == "interaction":
+            mode_color = (0, 255, 0)
+        else:
+            mode_color = (255, 255, 0)
+        
+        # Draw person status
+        if person_found:
+            status_text = "Person: DETECTED"
+            status_color = (0, 255, 0)
+        else:
+            status_text = "Person: NOT DETECTED"
+            status_color = (0, 0, 255)
+        
+        texts = [(mode_text, (10, 30), mode_color),
+                 (status_text, (10, 90), status_color)]
+        
+        # Tile just large enough to hold the text (plus stroke), clipped to the frame
+        font = cv2.FONT_HERSHEY_SIMPLEX
+        sizes = [cv2.getTextSize(text, font, 0.7, 2) for text, _, _ in texts]
+        tile_w = min(shape[1], 10 + max(size[0] for size, _ in sizes) + 2)
+        tile_h = min(shape[0], 90 + max(baseline for _, baseline in sizes) + 2)
+        
+        tile = np.zeros((tile_h, tile_w, 3), dtype=np.uint8)
+        for text, org, color in texts:
+            cv2.putText(tile, text, org, font, 0.7, color, 2)
+        mask = tile.any(axis=2, keepdims=True)
+        
+        return tile, mask
+    
+    def _draw_person(self, image, person_bbox, label):
+        """Draw person bbox, label and distance (if known) onto image in place"""
+        x_min, y_min, x_max, y_max = person_bbox
+        cv2.rectangle(image, (x_min, y_min), (x_max, y_max), (0, 255, 0), 2)
+        if label:
+            cv2.putText(image, label, (x_min, y_min - 10),
+                       cv2.FONT_HERSHEY_SIMPLEX, 0.6, (0, 255, 0), 2)
+        
+        # Draw distance if available
+        if self.distance_to_person is not None:
+            distance_text = f"Distance: {self.distance_to_person:.2f}m"
+            cv2.putText(image, distance_text, (x_min, y_max + 25),
+                       cv2.FONT_HERSHEY_SIMPLEX, 0.7, (0, 255, 255), 2)
+    
+    def _status_printer(self):
+        """Status thread: print a status summary to the terminal once a second"""
+        while not self.stop_evt.wait(1.0):
+            self._print_status()
     
     def _print_status(self):
         """Print current status to terminal"""
-        print(f"\n--- Status (Mode: {self.mode.upper()}) ---")
-        print(f"Person detected: {self.person_found}")
-        if self.person_found and self.person_bbox:
-            print(f"Person bbox: {self.person_bbox}")
-        if self.distance_to_person is not None:
-            print(f"Distance to person: {self.distance_to_person:.2f}m")
-        if self.mode == "interaction":
-            print(f"RPS Score: Player {self.game.player_score} - AI {self.game.ai_score}")
-            if self.last_rps_result:
-                print(f"Last result: {self.last_rps_result.value}")
-        print("-" * 40)
+        # One write per report, so it never interleaves with other output
+        print(self._format_status(self._snapshot_status()))
+    
+    def _snapshot_status(self):
+        """
+        Copy the status fields (the detection thread keeps updating them)
+        
+        Returns:
+            dict: Current mode, detection, distance and game state
+        """
+        return {
+            'mode': self.mode,
+            'person_found': self.person_found,
+            'person_bbox': self.person_bbox,
+            'distance': self.distance_to_person,
+            'last_result': self.last_rps_result,
+            'player_score': self.game.player_score,
+            'ai_score': self.game.ai_score,
+        }
+    
+    def _format_status(self, status):
+        """
+        Format a status snapshot for the terminal
+        
+        Args:
+            status: dict from _snapshot_status
+            
+        Returns:
+            str: Multi-line status report
+        """
+        lines = [f"\n--- Status (Mode: {status['mode'].upper()}) ---",
+                 f"Person detected: {status['person_found']}"]
+        if status['person_found'] and status['person_bbox']:
+            lines.append(f"Person bbox: {status['person_bbox']}")
+        if status['distance'] is not None:
+            lines.append(f"Distance to person: {status['distance']:.2f}m")
+        if status['mode'] == "interaction":
+            lines.append(f"RPS Score: Player {status['player_score']} - AI {status['ai_score']}")
+            if status['last_result']:
+                lines.append(f"Last result: {status['last_result'].value}")
+        lines.append("-" * 40)
+        return "\n".join(lines)
     
     def start_terminal_input_thread(self):
         """Start a thread to read terminal input"""
@@ -457,10 +889,13 @@ class Phase1Demo:
             while self.running:
                 try:
                     if sys.stdin.isatty():
-                        # Read a line (this will block, but that's OK in a separate thread)
-                        line = sys.stdin.readline()
-                        if line:
-                            self.terminal_input_queue.put(line)
+                        # Wait for input with a timeout so the thread notices
+                        # shutdown instead of blocking in readline
+                        ready, _, _ = select.select([sys.stdin], [], [], 0.2)
+                        if ready:
+                            line = sys.stdin.readline()
+                            if line:
+                                self.terminal_input_queue.put(line)
                     else:
                         time.sleep(0.1)
                 except (EOFError, KeyboardInterrupt):
@@ -476,6 +911,11 @@ class Phase1Demo:
         """Clean up resources"""
         print("\nCleaning up...")
         self.running = False  # Stop terminal input thread
+        self.stop_evt.set()  # Stop pipeline threads
+        for thread in (self._capture_thread, self._detect_thread,
+                       self._display_thread, self._status_thread):
+            if thread:
+                thread.join(timeout=2.0)
         if self.terminal_input_thread:
             self.terminal_input_thread.join(timeout=1.0)
         self.camera.release()
@@ -483,17 +923,19 @@ class Phase1Demo:
             self.person_detector.release()
         if hasattr(self, 'gesture_detector') and hasattr(self.gesture_detector, 'release'):
             self.gesture_detector.release()
-        if self.gui_available:
-            try:
-                cv2.destroyAllWindows()
-            except:
-                pass
         print("Cleanup complete!")
 
 
 def main():
     """Main entry point"""
-    demo = Phase1Demo()
+    import argparse
+    
+    parser = argparse.ArgumentParser(description='Phase 1: OAK-D Desktop Demo')
+    parser.add_argument('--opencl', action='store_true',
+                       help='Draw detection-mode overlays through OpenCL (cv2.UMat)')
+    args = parser.parse_args()
+    
+    demo = Phase1Demo(use_opencl=args.opencl)
     
     try:
         demo.run()
@@ -4,6 +4,8 @@ Provides RGB frames and depth maps for distance estimation
 """
 import cv2
 import numpy as np
+import threading
+from datetime import timedelta
 
 # Try to import depthai
 try:
@@ -13,29 +15,123 @@ except ImportError:
     DEPTHAI_AVAILABLE = False
     print("Note: DepthAI not available. Will use webcam fallback.")
 
+# Numba is optional; it compiles the depth median and patch mean
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+
+if NUMBA_AVAILABLE:
+    @njit(cache=True)
+    def _roi_depth_median(roi):
+        """
+        Median of the valid (non-zero) depths in a uint16 ROI
+        
+        Counts depths into a histogram in one pass instead of gathering and
+        partitioning them; gives the same value as np.median.
+        
+        Args:
+            roi: 2D uint16 depth array (may be a strided view)
+            
+        Returns:
+            float: Median depth in millimeters, or 0.0 if no valid depth
+        """
+        hist = np.zeros(65536, dtype=np.int32)
+        n = 0
+        for y in range(roi.shape[0]):
+            for x in range(roi.shape[1]):
+                v = roi[y, x]
+                if v > 0:
+                    hist[v] += 1
+                    n += 1
+        if n == 0:
+            return 0.0
+        
+        # The two middle ranks (equal when n is odd)
+        lo_rank = (n - 1) // 2
+        hi_rank = n // 2
+        lo = -1
+        seen = 0
+        for v in range(1, 65536):
+            seen += hist[v]
+            if lo < 0 and seen > lo_rank:
+                lo = v
+            if seen > hi_rank:
+                return (lo + v) / 2.0
+        return float(lo)
+    
+    @njit(cache=True)
+    def _patch_mean(patch):
+        """
+        Mean of the valid (non-zero) depths in a uint16 patch
+        
+        Sums and counts in one pass instead of masking and compacting first.
+        
+        Args:
+            patch: 2D uint16 depth array
+            
+        Returns:
+            float: Mean depth in millimeters, or -1.0 if no valid depth
+        """
+        total = np.uint64(0)
+        n = 0
+        for y in range(patch.shape[0]):
+            for x in range(patch.shape[1]):
+                v = patch[y, x]
+                if v > 0:
+                    total += v
+                    n += 1
+        if n == 0:
+            return -1.0
+        return total / n
+
 
 class Phase1OAKDCamera:
     """
     Enhanced OAK-D camera with RGB and depth support
     """
-    def __init__(self, use_oakd=True, fallback_camera_id=0):
+    def __init__(self, use_oakd=True, fallback_camera_id=0, detect_persons=False):
         """
         Initialize the OAK-D camera with depth support
         
         Args:
             use_oakd: If True, try to use OAKD camera first
             fallback_camera_id: Camera ID to use if OAKD is not available
+            detect_persons: If True, also run MobileNet-SSD on the color
+                            stream in this pipeline and expose nn_queue
+                            (pass the camera to PersonDetector)
         """
         self.pipeline = None
         self.device = None
         self.rgb_queue = None
         self.depth_queue = None
+        self.nn_queue = None
         self.use_oakd = use_oakd
+        self.detect_persons = detect_persons
         self.fallback_camera_id = fallback_camera_id
         self.fallback_camera = None
         self.using_fallback = False
         self.has_depth = False
         
+        # Depth frame fetched for the current RGB frame, so several distance
+        # queries on one frame share a single depth_queue read
+        self._frame_seq = 0
+        self._last_depth = None
+        self._last_depth_seq = -1
+        # Validity masks for get_distance_at_point, keyed by patch shape
+        self._mask_bufs = {}
+        
+        # Newest messages from the device, written by the drain thread
+        self._slot_cond = threading.Condition()
+        self._rgb_slot = None
+        self._rgb_seq = 0       # RGB messages received
+        self._rgb_read_seq = 0  # _rgb_seq at the last get_frame
+        self._depth_slot = None
+        self._drain_stop = threading.Event()
+        self._drain_thread = None
+        
         self.setup_pipeline()
     
     def setup_pipeline(self):
@@ -49,8 +145,12 @@ class Phase1OAKDCamera:
                 cam_rgb = self.pipeline.create(dai.node.ColorCamera)
                 cam_rgb.setPreviewSize(640, 480)
                 cam_rgb.setResolution(dai.ColorCameraProperties.SensorResolution.THE_1080_P)
-                cam_rgb.setInterleaved(False)
-                cam_rgb.setColorOrder(dai.ColorCameraProperties.ColorOrder.RGB)
+                # Interleaved, so the host can view the frame data as
+                # (H, W, 3) without a planar-to-interleaved copy
+                cam_rgb.setInterleaved(True)
+                # Let the camera emit BGR (what OpenCV expects) so frames need
+                # no per-frame channel swap on the host
+                cam_rgb.setColorOrder(dai.ColorCameraProperties.ColorOrder.BGR)
                 
                 # Create mono cameras for depth
                 mono_left = self.pipeline.create(dai.node.MonoCamera)
@@ -92,13 +192,43 @@ class Phase1OAKDCamera:
                 mono_right.out.link(stereo.right)
                 stereo.depth.link(xout_depth.input)
                 
+                # Person detection on the same color stream: resize the
+                # preview to the 300x300 network input on the device
+                has_nn = False
+                if self.detect_persons:
+                    # Find the blob before adding any node, so a missing
+                    # blob leaves the pipeline as camera + depth only
+                    blob_path = None
+                    try:
+                        from phase1_person_detector import (
+                            create_detection_network, resolve_mobilenet_ssd_blob)
+                        blob_path = resolve_mobilenet_ssd_blob()
+                    except Exception as e:
+                        print(f"Warning: Person detection not added to pipeline: {e}")
+                    if blob_path is not None:
+                        manip = self.pipeline.create(dai.node.ImageManip)
+                        manip.initialConfig.setResize(300, 300)
+                        manip.initialConfig.setKeepAspectRatio(False)
+                        manip.initialConfig.setFrameType(dai.ImgFrame.Type.BGR888p)
+                        cam_rgb.preview.link(manip.inputImage)
+                        create_detection_network(self.pipeline, manip.out,
+                                                 blob_path=blob_path)
+                        has_nn = True
+                
                 # Connect to device and start pipeline
                 self.device = dai.Device(self.pipeline)
                 self.rgb_queue = self.device.getOutputQueue(name="rgb", maxSize=4, blocking=False)
                 self.depth_queue = self.device.getOutputQueue(name="depth", maxSize=4, blocking=False)
+                if has_nn:
+                    self.nn_queue = self.device.getOutputQueue(name="nn", maxSize=4, blocking=False)
                 
                 self.has_depth = True
                 self.using_fallback = False
+                
+                # Drain the device queues in the background so get_frame /
+                # get_depth_frame always see the newest frames
+                self._drain_thread = threading.Thread(target=self._drain, daemon=True)
+                self._drain_thread.start()
                 print("OAK-D camera with depth initialized successfully")
                 return
                 
@@ -116,43 +246,111 @@ class Phase1OAKDCamera:
         self.has_depth = False
         print("Using fallback webcam (no depth support)")
     
-    def get_frame(self):
+    def _drain(self):
+        """Drain thread: keep the newest RGB and depth messages in their slots"""
+        rgb_timeout = timedelta(milliseconds=100)
+        while not self._drain_stop.is_set():
+            try:
+                # Block on the device until the next RGB frame (the timeout
+                # lets the thread notice release())
+                in_rgb = self.rgb_queue.get(timeout=rgb_timeout)
+                if isinstance(in_rgb, tuple):
+                    # DepthAI returns (message, timed_out) when a timeout is given
+                    in_rgb, timed_out = in_rgb
+                    if timed_out:
+                        in_rgb = None
+                
+                # Depth runs at about the same rate; keep only the newest
+                depth_msgs = self.depth_queue.tryGetAll()
+                in_depth = depth_msgs[-1] if depth_msgs else None
+            except Exception as e:
+                if not self._drain_stop.is_set():
+                    print(f"Camera drain error: {e}")
+                    self._drain_stop.wait(0.1)
+                continue
+            
+            if in_rgb is None and in_depth is None:
+                continue
+            with self._slot_cond:
+                if in_rgb is not None:
+                    self._rgb_slot = in_rgb
+                    self._rgb_seq += 1
+                if in_depth is not None:
+                    self._depth_slot = in_depth
+                self._slot_cond.notify_all()
+    
+    def get_frame(self, timeout_ms=33):
         """
         Get a RGB frame from the camera
         
+        Args:
+            timeout_ms: How long to wait for the OAKD to deliver a frame
+                        (0 or None returns immediately if none is ready)
+        
         Returns:
-            numpy.ndarray: BGR frame, or None if no frame available
+            numpy.ndarray: BGR frame, or None if no frame available. On the
+                OAK-D this is a view of the device message's data (no copy).
         """
         if self.using_fallback:
             if self.fallback_camera is None:
                 return None
             ret, frame = self.fallback_camera.read()
-            return frame if ret else None
+            if not ret:
+                return None
+            self._frame_seq += 1
+            return frame
         
-        if self.rgb_queue is None:
+        if self._drain_thread is None:
             return None
         
-        in_rgb = self.rgb_queue.tryGet()
-        if in_rgb is not None:
+        # Take the newest frame not returned yet, waiting for one if needed
+        with self._slot_cond:
+            if timeout_ms and self._rgb_seq == self._rgb_read_seq:
+                self._slot_cond.wait_for(lambda: self._rgb_seq != self._rgb_read_seq,
+                                         timeout_ms / 1000.0)
+            if self._rgb_seq == self._rgb_read_seq:
+                return None
+            in_rgb = self._rgb_slot
+            self._rgb_read_seq = self._rgb_seq
+        
+        # Interleaved frames come back as an (H, W, 3) view of the message;
+        # planar ones come back as (3, H, W), which is 3-D as well
+        frame = in_rgb.getFrame()
+        if frame.ndim != 3 or frame.shape[-1] != 3:
+            # Not interleaved on this DepthAI version; let it convert
             frame = in_rgb.getCvFrame()
-            # Convert RGB to BGR for OpenCV
-            frame = cv2.cvtColor(frame, cv2.COLOR_RGB2BGR)
-            return frame
-        return None
+        self._frame_seq += 1
+        return frame
     
-    def get_depth_frame(self):
+    def get_depth_frame(self, cache=True):
         """
         Get a depth frame from the camera
         
+        Args:
+            cache: If True, return the depth frame already fetched since the
+                   last get_frame() instead of reading the queue again
+        
         Returns:
-            numpy.ndarray: Depth frame (16-bit), or None if no depth available
+            numpy.ndarray: Depth frame (uint16, millimeters), or None if no
+                depth available
         """
         if not self.has_depth or self.depth_queue is None:
             return None
         
-        in_depth = self.depth_queue.tryGet()
+        if cache and self._last_depth is not None and self._last_depth_seq == self._frame_seq:
+            return self._last_depth
+        
+        # Take the newest depth message not returned yet
+        with self._slot_cond:
+            in_depth = self._depth_slot
+            self._depth_slot = None
         if in_depth is not None:
-            depth_frame = in_depth.getFrame()
+            # getFrame() is a view of the message data, and depth arrives as
+            # uint16 already; astype(copy=False) is a no-op then and only
+            # guards against a wider dtype slipping through
+            depth_frame = in_depth.getFrame().astype(np.uint16, copy=False)
+            self._last_depth = depth_frame
+            self._last_depth_seq = self._frame_seq
             return depth_frame
         return None
     
@@ -163,7 +361,8 @@ class Phase1OAKDCamera:
         Args:
             x: X coordinate
             y: Y coordinate
-            depth_frame: Optional depth frame (if None, will get from camera)
+            depth_frame: Optional depth frame (if None, uses the one for the
+                         current frame, fetching it if needed)
             patch_size: Size of patch to average over (default 10x10)
             
         Returns:
@@ -191,24 +390,54 @@ class Phase1OAKDCamera:
         # Extract patch and calculate average depth
         patch = depth_frame[y_min:y_max, x_min:x_max]
         
-        # Filter out invalid depth values (0 or very large)
-        valid_depths = patch[patch > 0]
-        if len(valid_depths) == 0:
-            return None
+        if patch.dtype == np.uint16:
+            # Invalid depths are 0, so average the non-zero depths directly
+            # instead of building a masked copy
+            if NUMBA_AVAILABLE:
+                avg_depth_mm = _patch_mean(patch)
+            else:
+                # Masked mean in OpenCV, with the mask built into a reused buffer
+                mask = self._mask_bufs.get(patch.shape)
+                if mask is None:
+                    mask = np.empty(patch.shape, dtype=np.uint8)
+                    self._mask_bufs[patch.shape] = mask
+                cv2.compare(patch, 0, cv2.CMP_GT, mask)
+                if cv2.countNonZero(mask) > 0:
+                    avg_depth_mm = cv2.mean(patch, mask=mask)[0]
+                else:
+                    avg_depth_mm = -1.0
+            if avg_depth_mm < 0:
+                return None
+        else:
+            # Filter out invalid depth values (0 or very large)
+            valid_depths = patch[patch > 0]
+            if len(valid_depths) == 0:
+                return None
+            
+            # Average depth in millimeters
+            avg_depth_mm = np.mean(valid_depths)
         
-        # Average depth in millimeters, convert to meters
-        avg_depth_mm = np.mean(valid_depths)
+        # Convert to meters
         distance_m = avg_depth_mm / 1000.0
         
         return distance_m
     
-    def get_distance_from_bbox(self, bbox, depth_frame=None):
+    def get_distance_from_bbox(self, bbox, depth_frame=None, stride=4, roi_frac=1.0):
         """
-        Get distance at the center of a bounding box
+        Get distance to the object inside a bounding box
+        
+        Uses the median of the valid depths inside the box, sampled on a
+        strided grid: a person-sized ROI is smooth enough that every
+        stride-th pixel gives the same median while touching far less memory.
         
         Args:
             bbox: Bounding box (x_min, y_min, x_max, y_max)
-            depth_frame: Optional depth frame (if None, will get from camera)
+            depth_frame: Optional depth frame (if None, uses the one for the
+                         current frame, fetching it if needed)
+            stride: Sample every stride-th pixel in each direction
+            roi_frac: Only use the centered roi_frac x roi_frac part of the
+                      box (e.g. 0.4 skips the background around a person's
+                      outline and reads ~1/6 of the pixels)
             
         Returns:
             float: Distance in meters, or None if unavailable
@@ -216,13 +445,42 @@ class Phase1OAKDCamera:
         if bbox is None:
             return None
         
+        if depth_frame is None:
+            depth_frame = self.get_depth_frame()
+        
+        if depth_frame is None:
+            return None
+        
+        h, w = depth_frame.shape[:2]
         x_min, y_min, x_max, y_max = bbox
         
-        # Calculate center of bounding box
-        center_x = (x_min + x_max) / 2
-        center_y = (y_min + y_max) / 2
+        if roi_frac < 1.0:
+            # Shrink the box around its center
+            margin_x = (x_max - x_min) * (1.0 - roi_frac) / 2.0
+            margin_y = (y_max - y_min) * (1.0 - roi_frac) / 2.0
+            x_min, x_max = x_min + margin_x, x_max - margin_x
+            y_min, y_max = y_min + margin_y, y_max - margin_y
+        
+        # Clamp the box to the depth frame
+        x_min = max(0, min(w, int(x_min)))
+        x_max = max(0, min(w, int(x_max)))
+        y_min = max(0, min(h, int(y_min)))
+        y_max = max(0, min(h, int(y_max)))
+        
+        # Strided view of the ROI (no copy)
+        roi = depth_frame[y_min:y_max:stride, x_min:x_max:stride]
         
-        return self.get_distance_at_point(center_x, center_y, depth_frame)
+        if NUMBA_AVAILABLE and roi.dtype == np.uint16:
+            median = _roi_depth_median(roi)
+            return median / 1000.0 if median > 0 else None
+        
+        # Filter out invalid depth values (0)
+        valid_depths = roi[roi > 0]
+        if len(valid_depths) == 0:
+            return None
+        
+        # Median depth in millimeters, convert to meters
+        return float(np.median(valid_depths)) / 1000.0
     
     def release(self):
         """Release camera resources"""
@@ -230,9 +488,24 @@ class Phase1OAKDCamera:
             if self.fallback_camera:
                 self.fallback_camera.release()
         else:
-            if self.device:
-                del self.device
-            self.pipeline = None
+            # Stop reading the queues before the device goes away
+            self._drain_stop.set()
+            if self._drain_thread is not None:
+                self._drain_thread.join(timeout=0.5)
+                self._drain_thread = None
             self.rgb_queue = None
             self.depth_queue = None
+            self.nn_queue = None
+            self._rgb_slot = None
+            self._depth_slot = None
+            self._last_depth = None
+            # Close explicitly: dropping the reference leaves the USB device
+            # open while anything else still holds it
+            if self.device is not None:
+                try:
+                    self.device.close()
+                except AttributeError:
+                    pass
+                self.device = None
+            self.pipeline = None
 
@@ -2,6 +2,7 @@
 Person Detection using OAK-D's MobileNet-SSD Model
 Detects persons in the frame and returns bounding boxes
 """
+import os
 import cv2
 import numpy as np
 
@@ -13,20 +14,131 @@ except ImportError:
     DEPTHAI_AVAILABLE = False
     print("Note: DepthAI not available. Person detection will use fallback.")
 
+# ONNX Runtime is optional; runs an int8 MobileNet-SSD in the fallback detector
+try:
+    import onnxruntime as ort
+    ORT_AVAILABLE = True
+except ImportError:
+    ORT_AVAILABLE = False
+
+
+# Blob path resolved by get_mobilenet_ssd_path, reused by later detectors
+_cached_blob = None
+MOBILENET_SSD_BLOB = os.path.expanduser(
+    "~/.cache/blobconverter/mobilenet-ssd_openvino_2021.4_6shave.blob")
+
+
+def get_mobilenet_ssd_path():
+    """
+    Get path to MobileNet-SSD model blob
+    DepthAI will download it automatically if not present
+    
+    The resolved path is remembered, and blobconverter's cache file is
+    checked before blobconverter itself (which re-validates on every call).
+    """
+    global _cached_blob
+    if _cached_blob is not None and os.path.exists(_cached_blob):
+        return _cached_blob
+    
+    # Already downloaded by blobconverter
+    if os.path.exists(MOBILENET_SSD_BLOB):
+        _cached_blob = MOBILENET_SSD_BLOB
+        return _cached_blob
+    
+    # Use blobconverter to get the model
+    try:
+        import blobconverter
+        blob_path = blobconverter.from_zoo(
+            name="mobilenet-ssd",
+            shaves=6,
+            version="2021.4"
+        )
+        _cached_blob = str(blob_path)
+        return _cached_blob
+    except ImportError:
+        # No cached blob and no blobconverter to fetch one
+        # User will need to download the model manually
+        raise RuntimeError(
+            "MobileNet-SSD model not found. Please install blobconverter:\n"
+            "pip install blobconverter\n"
+            "Or download the model manually."
+        )
+
+
+def resolve_mobilenet_ssd_blob():
+    """
+    Find the MobileNet-SSD blob, falling back to a plain blobconverter fetch
+    
+    Returns:
+        str: Path to the blob
+        
+    Raises:
+        RuntimeError: If no blob could be found or downloaded
+    """
+    # Use built-in mobilenet-ssd model
+    # The model path will be automatically downloaded by DepthAI
+    try:
+        return get_mobilenet_ssd_path()
+    except Exception as e:
+        print(f"Warning: Could not get mobilenet-ssd blob: {e}")
+        print("Trying to use blobconverter...")
+        try:
+            import blobconverter
+            return str(blobconverter.from_zoo(name="mobilenet-ssd", shaves=6))
+        except Exception as e2:
+            print(f"Error: Could not load mobilenet-ssd model: {e2}")
+            raise RuntimeError("Could not initialize MobileNet-SSD model")
+
+
+def create_detection_network(pipeline, source, stream_name="nn", blob_path=None):
+    """
+    Add a MobileNet-SSD node to an existing pipeline
+    
+    Lets the main camera pipeline run person detection on its own color
+    stream instead of opening a second device. The blob is resolved before
+    any node is created, so a missing blob leaves the pipeline untouched.
+    
+    Args:
+        pipeline: dai.Pipeline to add the nodes to
+        source: 300x300 BGR planar output to feed the network
+                (e.g. a ColorCamera preview or ImageManip out)
+        stream_name: XLinkOut stream name for the detections
+        blob_path: Path to the MobileNet-SSD blob (resolved if None)
+        
+    Returns:
+        dai.node.MobileNetDetectionNetwork: The detection node
+    """
+    if blob_path is None:
+        blob_path = resolve_mobilenet_ssd_blob()
+    
+    detection_nn = pipeline.create(dai.node.MobileNetDetectionNetwork)
+    detection_nn.setBlobPath(blob_path)
+    detection_nn.setConfidenceThreshold(0.5)
+    detection_nn.input.setBlocking(False)
+    
+    xout_nn = pipeline.create(dai.node.XLinkOut)
+    xout_nn.setStreamName(stream_name)
+    
+    source.link(detection_nn.input)
+    detection_nn.out.link(xout_nn.input)
+    return detection_nn
+
 
 class PersonDetector:
     """
     Person detector using OAK-D's built-in MobileNet-SSD model
-    Note: This creates a separate pipeline. For better integration, 
-    consider using a shared pipeline with the main camera.
+    Pass a Phase1OAKDCamera created with detect_persons=True to share its
+    pipeline; otherwise a separate pipeline (and device) is created.
     """
-    def __init__(self, use_separate_pipeline=True):
+    def __init__(self, use_separate_pipeline=True, camera=None):
         """
         Initialize person detector
         
         Args:
             use_separate_pipeline: If True, creates separate camera pipeline.
                                   If False, expects frames to be passed in.
+            camera: Optional Phase1OAKDCamera with detect_persons=True; its
+                    detection queue is used and no pipeline is created
         """
         self.pipeline = None
         self.device = None
@@ -40,7 +152,13 @@ class PersonDetector:
             self.available = False
             return
         
-        if use_separate_pipeline:
+        if camera is not None and getattr(camera, 'nn_queue', None) is not None:
+            # Detections come from the camera's own pipeline
+            self.nn_queue = camera.nn_queue
+            self.use_separate_pipeline = False
+            self.available = True
+            print("Person detector initialized (shared camera pipeline)")
+        elif use_separate_pipeline:
             self.available = True
             self.setup_pipeline()
         else:
@@ -61,38 +179,15 @@ class PersonDetector:
             cam_rgb.setInterleaved(False)
             cam_rgb.setColorOrder(dai.ColorCameraProperties.ColorOrder.BGR)
             
-            # Create detection network
-            self.detection_nn = self.pipeline.create(dai.node.MobileNetDetectionNetwork)
-            # Use built-in mobilenet-ssd model
-            # The model path will be automatically downloaded by DepthAI
-            try:
-                blob_path = self._get_mobilenet_ssd_path()
-                self.detection_nn.setBlobPath(blob_path)
-            except Exception as e:
-                print(f"Warning: Could not get mobilenet-ssd blob: {e}")
-                print("Trying to use blobconverter...")
-                try:
-                    import blobconverter
-                    blob_path = blobconverter.from_zoo(name="mobilenet-ssd", shaves=6)
-                    self.detection_nn.setBlobPath(blob_path)
-                except Exception as e2:
-                    print(f"Error: Could not load mobilenet-ssd model: {e2}")
-                    raise RuntimeError("Could not initialize MobileNet-SSD model")
-            
-            self.detection_nn.setConfidenceThreshold(0.5)
-            self.detection_nn.input.setBlocking(False)
+            # Create detection network (and its "nn" output)
+            self.detection_nn = create_detection_network(self.pipeline, cam_rgb.preview)
             
             # Create output
             xout_rgb = self.pipeline.create(dai.node.XLinkOut)
             xout_rgb.setStreamName("rgb")
             
-            xout_nn = self.pipeline.create(dai.node.XLinkOut)
-            xout_nn.setStreamName("nn")
-            
             # Linking
-            cam_rgb.preview.link(self.detection_nn.input)
             cam_rgb.preview.link(xout_rgb.input)
-            self.detection_nn.out.link(xout_nn.input)
             
             # Connect to device
             self.device = dai.Device(self.pipeline)
@@ -106,76 +201,41 @@ class PersonDetector:
             print("Falling back to basic detection...")
             self.available = False
     
-    def _get_mobilenet_ssd_path(self):
-        """
-        Get path to MobileNet-SSD model blob
-        DepthAI will download it automatically if not present
-        """
-        # Use blobconverter to get the model
-        try:
-            import blobconverter
-            blob_path = blobconverter.from_zoo(
-                name="mobilenet-ssd",
-                shaves=6,
-                version="2021.4"
-            )
-            return blob_path
-        except ImportError:
-            # If blobconverter not available, try to download manually
-            # or use a local path if model is already downloaded
-            import os
-            model_path = os.path.expanduser("~/.cache/blobconverter/mobilenet-ssd_openvino_2021.4_6shave.blob")
-            if os.path.exists(model_path):
-                return model_path
-            else:
-                # Return a path that DepthAI might recognize
-                # User will need to download the model manually
-                raise RuntimeError(
-                    "MobileNet-SSD model not found. Please install blobconverter:\n"
-                    "pip install blobconverter\n"
-                    "Or download the model manually."
-                )
-    
-    def detect_person(self, frame=None):
+    def detect_person(self, frame=None, out=None):
         """
         Detect person in frame
         
         Args:
             frame: BGR frame to detect person in (required if not using separate pipeline)
                   If using separate pipeline and frame is None, will get from camera queue
+                  Not modified; only its size is used to scale the detection
+            out: Optional BGR image to draw the bbox and label into (for
+                 example the caller's display buffer). Nothing is drawn if None.
             
         Returns:
-            tuple: (person_found, person_bbox, annotated_frame)
+            tuple: (person_found, person_bbox, label)
                 - person_found: True if person detected, False otherwise
                 - person_bbox: (x_min, y_min, x_max, y_max) or None
-                - annotated_frame: Frame with detection annotations
+                - label: Text to draw above the bbox, or None
         """
         if not self.available:
-            if frame is not None:
-                return False, None, frame
             return False, None, None
         
-        if self.use_separate_pipeline:
-            # Get frame from camera queue (for detection)
-            in_rgb = self.rgb_queue.tryGet()
-            if in_rgb is None:
-                if frame is not None:
-                    return False, None, frame
-                return False, None, None
+        if self.use_separate_pipeline or self.nn_queue is not None:
+            if self.use_separate_pipeline:
+                # Get frame from camera queue (for detection)
+                in_rgb = self.rgb_queue.tryGet()
+                if in_rgb is None:
+                    return False, None, None
             
-            # Get detection frame (300x300 from camera)
-            detection_frame = in_rgb.getCvFrame()
-            
-            # Use provided frame for display if available, otherwise use detection frame
+            # Scale to the provided frame if there is one, otherwise report
+            # in detection frame (300x300 from camera) coordinates
             if frame is not None:
-                annotated_frame = frame.copy()
                 h, w = frame.shape[:2]
+            elif self.use_separate_pipeline:
+                h, w = in_rgb.getCvFrame().shape[:2]
             else:
-                annotated_frame = detection_frame.copy()
-                h, w = annotated_frame.shape[:2]
-            
-            person_found = False
-            person_bbox = None
+                h, w = 300, 300
             
             # Get detection results
             in_nn = self.nn_queue.tryGet()
@@ -183,26 +243,16 @@ class PersonDetector:
                 detections = in_nn.detections
                 
                 # Find person detections (class 15 in COCO dataset for person)
-                # Note: Detection coordinates are relative to 300x300 preview
-                # We need to scale them to the actual frame size
-                if frame is not None:
-                    # Scale from 300x300 to actual frame size
-                    scale_x = w / 300.0
-                    scale_y = h / 300.0
-                else:
-                    scale_x = 1.0
-                    scale_y = 1.0
-                
+                # Detection coordinates are normalized, so scaling by the
+                # target size maps them straight onto the frame
                 for detection in detections:
                     # COCO class 15 is "person"
                     if detection.label == 15:
-                        person_found = True
-                        
                         # Get bounding box coordinates (scale to actual frame size)
-                        x_min = int(detection.xmin * 300 * scale_x)
-                        y_min = int(detection.ymin * 300 * scale_y)
-                        x_max = int(detection.xmax * 300 * scale_x)
-                        y_max = int(detection.ymax * 300 * scale_y)
+                        x_min = int(detection.xmin * w)
+                        y_min = int(detection.ymin * h)
+                        x_max = int(detection.xmax * w)
+                        y_max = int(detection.ymax * h)
                         
                         # Clamp to frame bounds
                         x_min = max(0, min(w - 1, x_min))
@@ -211,35 +261,36 @@ class PersonDetector:
                         y_max = max(0, min(h - 1, y_max))
                         
                         person_bbox = (x_min, y_min, x_max, y_max)
-                        
-                        # Draw bounding box
-                        cv2.rectangle(annotated_frame, (x_min, y_min), (x_max, y_max), (0, 255, 0), 2)
-                        
-                        # Draw label
                         label = f"Person {detection.confidence:.2f}"
-                        cv2.putText(annotated_frame, label, (x_min, y_min - 10),
-                                   cv2.FONT_HERSHEY_SIMPLEX, 0.6, (0, 255, 0), 2)
+                        
+                        # Draw only when the caller asked for it
+                        if out is not None:
+                            cv2.rectangle(out, (x_min, y_min), (x_max, y_max), (0, 255, 0), 2)
+                            cv2.putText(out, label, (x_min, y_min - 10),
+                                       cv2.FONT_HERSHEY_SIMPLEX, 0.6, (0, 255, 0), 2)
                         
                         # Only take the first (most confident) person detection
-                        break
+                        return True, person_bbox, label
             
-            return person_found, person_bbox, annotated_frame
+            return False, None, None
         else:
             # Not using separate pipeline - would need to process frame here
-            # For now, fall back to fallback detector
-            if frame is None:
-                return False, None, None
-            # Use a simple approach - just return frame without detection
+            # For now, report no detection
             # In a full implementation, you'd process the frame here
-            return False, None, frame
+            return False, None, None
     
     def release(self):
         """Release resources"""
-        if self.device:
-            del self.device
-        self.pipeline = None
         self.rgb_queue = None
         self.nn_queue = None
+        # Only set for a separate pipeline; a shared camera closes its own
+        if self.device is not None:
+            try:
+                self.device.close()
+            except AttributeError:
+                pass
+            self.device = None
+        self.pipeline = None
 
 
 # Fallback person detector using OpenCV DNN (for testing without OAK-D)
@@ -247,9 +298,32 @@ class PersonDetectorFallback:
     """
     Fallback person detector using OpenCV DNN
     For testing when OAK-D is not available
+    
+    If onnxruntime is installed and an int8-quantized ONNX export of the same
+    MobileNet-SSD (with the Caffe model's [1, 1, N, 7] detection output) is at
+    ONNX_MODEL_PATH, it is run through ONNX Runtime instead.
     """
+    ONNX_MODEL_PATH = 'models/mobilenet_ssd_int8.onnx'
+    
     def __init__(self):
         """Initialize fallback detector"""
+        self.session = None
+        if ORT_AVAILABLE and os.path.exists(self.ONNX_MODEL_PATH):
+            try:
+                self.session = ort.InferenceSession(self.ONNX_MODEL_PATH,
+                                                    providers=['CPUExecutionProvider'])
+                self._input_name = self.session.get_inputs()[0].name
+                # Network input, filled in place every frame
+                self._resized = np.empty((300, 300, 3), dtype=np.uint8)
+                self._input = np.empty((1, 3, 300, 300), dtype=np.float32)
+                self.net = None
+                self.available = True
+                print(f"Fallback person detector using ONNX Runtime: {self.ONNX_MODEL_PATH}")
+                return
+            except Exception as e:
+                print(f"Warning: Could not load {self.ONNX_MODEL_PATH}: {e}")
+                self.session = None
+        
         try:
             # Load MobileNet-SSD model
             self.net = cv2.dnn.readNetFromCaffe(
@@ -267,46 +341,47 @@ class PersonDetectorFallback:
         Detect person in frame using OpenCV DNN
         
         Args:
-            frame: BGR frame
+            frame: BGR frame (not modified)
             
         Returns:
-            tuple: (person_found, person_bbox, annotated_frame)
+            tuple: (person_found, person_bbox, label)
+                - person_bbox: (x_min, y_min, x_max, y_max) or None
+                - label: Text to draw above the bbox, or None
         """
-        if not self.available or self.net is None:
-            return False, None, frame
-        
-        annotated_frame = frame.copy()
-        person_found = False
-        person_bbox = None
+        if not self.available:
+            return False, None, None
         
         h, w = frame.shape[:2]
-        blob = cv2.dnn.blobFromImage(frame, 0.007843, (300, 300), 127.5)
-        self.net.setInput(blob)
-        detections = self.net.forward()
+        if self.session is not None:
+            # Same preprocessing as blobFromImage below, without allocating
+            cv2.resize(frame, (300, 300), dst=self._resized)
+            np.subtract(self._resized.transpose(2, 0, 1), np.float32(127.5), out=self._input[0])
+            np.multiply(self._input, np.float32(0.007843), out=self._input)
+            detections = self.session.run(None, {self._input_name: self._input})[0]
+            detections = detections.reshape(1, 1, -1, 7)
+        elif self.net is not None:
+            # Mean as a 3-tuple: a bare 127.5 becomes Scalar(127.5, 0, 0) and
+            # would only be subtracted from the blue channel
+            blob = cv2.dnn.blobFromImage(frame, 0.007843, (300, 300), (127.5, 127.5, 127.5))
+            self.net.setInput(blob)
+            detections = self.net.forward()
+        else:
+            return False, None, None
         
-        # Find person detections (class 15)
-        for i in range(detections.shape[2]):
-            confidence = detections[0, 0, i, 2]
-            class_id = int(detections[0, 0, i, 1])
-            
-            if confidence > 0.5 and class_id == 15:  # Person class
-                person_found = True
-                
-                # Get bounding box
-                x_min = int(detections[0, 0, i, 3] * w)
-                y_min = int(detections[0, 0, i, 4] * h)
-                x_max = int(detections[0, 0, i, 5] * w)
-                y_max = int(detections[0, 0, i, 6] * h)
-                
-                person_bbox = (x_min, y_min, x_max, y_max)
-                
-                # Draw bounding box
-                cv2.rectangle(annotated_frame, (x_min, y_min), (x_max, y_max), (0, 255, 0), 2)
-                cv2.putText(annotated_frame, f"Person {confidence:.2f}", (x_min, y_min - 10),
-                           cv2.FONT_HERSHEY_SIMPLEX, 0.6, (0, 255, 0), 2)
-                break
+        # Most confident person detection (class 15), in one pass over the
+        # [N, 7] rows: (image_id, class_id, confidence, x_min, y_min, x_max, y_max)
+        det = detections[0, 0]
+        if len(det) == 0:
+            return False, None, None
+        scores = np.where(det[:, 1] == 15, det[:, 2], 0)
+        i = int(scores.argmax())
+        if scores[i] <= 0.5:
+            return False, None, None
         
-        return person_found, person_bbox, annotated_frame
+        # Get bounding box
+        x_min, y_min, x_max, y_max = det[i, 3:7]
+        person_bbox = (int(x_min * w), int(y_min * h), int(x_max * w), int(y_max * h))
+        return True, person_bbox, f"Person {det[i, 2]:.2f}"
     
     def release(self):
         """Release resources"""
@@ -32,13 +32,15 @@ class Phase1RPSGame:
     Wrapper for Rock-Paper-Scissors game
     Provides simple play_round interface
     """
-    def __init__(self, model_path=None, use_model=True):
+    def __init__(self, model_path=None, use_model=True, sess_options=None, providers=None):
         """
         Initialize the RPS game
         
         Args:
             model_path: Path to model file (optional)
             use_model: Whether to use model (True) or MediaPipe (False)
+            sess_options: Optional ONNX Runtime session options for the model
+            providers: Optional ONNX Runtime execution providers for the model
         """
         self.game = RockPaperScissorsGame()
         
@@ -48,7 +50,9 @@ class Phase1RPSGame:
         
         if use_model and USE_MODEL:
             try:
-                self.gesture_detector = HandGestureDetectorModel(model_path=model_path)
+                self.gesture_detector = HandGestureDetectorModel(model_path=model_path,
+                                                                 sess_options=sess_options,
+                                                                 providers=providers)
                 print("Using trained PyTorch model for RPS")
             except Exception as e:
                 print(f"Failed to load model: {e}")
@@ -60,19 +64,35 @@ class Phase1RPSGame:
             self.gesture_detector = HandGestureDetector()
         
         # Game state
+        self._gesture_none = Gesture.NONE
         self.current_gesture = Gesture.NONE
         self.gesture_hold_time = 0
         self.gesture_hold_threshold = 30  # Frames to hold gesture before playing
+        
+        # Whether detect_gesture returns a tuple; probed on the first call
+        self._detect_returns_tuple = None
+        # Returned (and updated in place) by every play_round call
+        self._result = {
+            'result': None,
+            'player_gesture': Gesture.NONE,
+            'ai_gesture': None,
+            'player_score': 0,
+            'ai_score': 0,
+            'round_count': 0
+        }
     
-    def play_round(self, frame):
+    def play_round(self, frame, bbox=None):
         """
         Play a round of rock-paper-scissors
         
         Args:
             frame: BGR image frame containing hand gesture
+            bbox: Optional person bbox (x_min, y_min, x_max, y_max); the
+                  gesture detector then only sees that region of the frame
             
         Returns:
-            dict: Game result with keys:
+            dict: Game result (the same dict every call, updated in place;
+                copy it to keep a result across calls) with keys:
                 - 'result': GameResult enum or None (if no valid gesture yet)
                 - 'player_gesture': Gesture enum
                 - 'ai_gesture': Gesture enum or None
@@ -80,41 +100,52 @@ class Phase1RPSGame:
                 - 'ai_score': int
                 - 'round_count': int
         """
+        # Crop to the person (a view, no copy) so the detector processes
+        # fewer pixels
+        if bbox is not None:
+            h, w = frame.shape[:2]
+            x_min, y_min, x_max, y_max = bbox
+            x_min, y_min = max(0, int(x_min)), max(0, int(y_min))
+            x_max, y_max = min(w, int(x_max)), min(h, int(y_max))
+            if x_max > x_min and y_max > y_min:
+                frame = frame[y_min:y_max, x_min:x_max]
+        
         # Detect gesture from frame
         result = self.gesture_detector.detect_gesture(frame)
         
-        # Handle different return formats
-        if isinstance(result, tuple):
-            gesture = result[0]
-        else:
-            gesture = result
+        # Handle different return formats (the detector does not change, so
+        # check its format once)
+        if self._detect_returns_tuple is None:
+            self._detect_returns_tuple = isinstance(result, tuple)
+        gesture = result[0] if self._detect_returns_tuple else result
         
         # Update gesture hold time
-        if gesture != Gesture.NONE:
+        gesture_none = self._gesture_none
+        if gesture != gesture_none:
             if gesture == self.current_gesture:
                 self.gesture_hold_time += 1
             else:
                 self.current_gesture = gesture
                 self.gesture_hold_time = 1
         else:
-            self.current_gesture = Gesture.NONE
+            self.current_gesture = gesture_none
             self.gesture_hold_time = 0
         
         # Play round if gesture held long enough
         game_result = None
         if (self.gesture_hold_time >= self.gesture_hold_threshold and 
-            self.current_gesture != Gesture.NONE and
+            self.current_gesture != gesture_none and
             self.game.result is None):
             game_result = self.game.play_round(self.current_gesture)
         
-        return {
-            'result': game_result,
-            'player_gesture': self.current_gesture,
-            'ai_gesture': self.game.ai_choice if game_result is not None else None,
-            'player_score': self.game.player_score,
-            'ai_score': self.game.ai_score,
-            'round_count': self.game.round_count
-        }
+        out = self._result
+        out['result'] = game_result
+        out['player_gesture'] = self.current_gesture
+        out['ai_gesture'] = self.game.ai_choice if game_result is not None else None
+        out['player_score'] = self.game.player_score
+        out['ai_score'] = self.game.ai_score
+        out['round_count'] = self.game.round_count
+        return out
     
     def reset_round(self):
         """Reset the current round (keep scores)"""
@@ -1,38 +1,32 @@
 """
 Simple test script for Phase 1 components
 Tests each module individually
+
+Run as a script (python test_phase1.py) or with pytest; the tests are
+independent, so pytest-xdist can spread them over worker processes:
+    pytest -n auto test_phase1.py
+
+On a fresh checkout (e.g. a CI job), byte-compile first so the runs load
+.pyc files, and use -X importtime to see which imports dominate startup:
+    python -m compileall -q . && python -X importtime -m pytest -n auto test_phase1.py 2> importtime.log
 """
 import sys
 import os
+import importlib.util
 
 def check_dependencies():
     """Check if required dependencies are installed"""
     missing = []
     
-    try:
-        import cv2
-    except ImportError:
-        missing.append("opencv-python")
-    
-    try:
-        import numpy
-    except ImportError:
-        missing.append("numpy")
-    
-    try:
-        import mediapipe
-    except ImportError:
-        missing.append("mediapipe")
-    
-    try:
-        import six
-    except ImportError:
-        missing.append("six")
-    
-    try:
-        import depthai
-    except ImportError:
-        missing.append("depthai (optional)")
+    # find_spec only locates each module; importing mediapipe, depthai and
+    # cv2 just to check they exist would take seconds
+    for module, package in (("cv2", "opencv-python"),
+                            ("numpy", "numpy"),
+                            ("mediapipe", "mediapipe"),
+                            ("six", "six"),
+                            ("depthai", "depthai (optional)")):
+        if importlib.util.find_spec(module) is None:
+            missing.append(package)
     
     if missing:
         print("\n⚠ Missing dependencies:")
@@ -50,90 +44,77 @@ def check_dependencies():
 def test_imports():
     """Test if all modules can be imported"""
     print("Testing imports...")
-    try:
-        from phase1_oakd_camera import Phase1OAKDCamera
-        print("✓ phase1_oakd_camera imported")
-    except Exception as e:
-        print(f"✗ phase1_oakd_camera import failed: {e}")
-        return False
-    
-    try:
-        from phase1_person_detector import PersonDetector, PersonDetectorFallback
-        print("✓ phase1_person_detector imported")
-    except Exception as e:
-        print(f"✗ phase1_person_detector import failed: {e}")
-        return False
+    from phase1_oakd_camera import Phase1OAKDCamera
+    print("✓ phase1_oakd_camera imported")
     
-    try:
-        from phase1_rps_game import Phase1RPSGame
-        print("✓ phase1_rps_game imported")
-    except Exception as e:
-        print(f"✗ phase1_rps_game import failed: {e}")
-        return False
+    from phase1_person_detector import PersonDetector, PersonDetectorFallback
+    print("✓ phase1_person_detector imported")
     
-    try:
-        from phase1_demo import Phase1Demo
-        print("✓ phase1_demo imported")
-    except Exception as e:
-        print(f"✗ phase1_demo import failed: {e}")
-        return False
+    from phase1_rps_game import Phase1RPSGame
+    print("✓ phase1_rps_game imported")
     
-    return True
+    from phase1_demo import Phase1Demo
+    print("✓ phase1_demo imported")
 
 
 def test_camera():
     """Test camera initialization"""
     print("\nTesting camera...")
+    from phase1_oakd_camera import Phase1OAKDCamera
+    camera = Phase1OAKDCamera()
+    print("✓ Camera initialized")
+    
     try:
-        from phase1_oakd_camera import Phase1OAKDCamera
-        camera = Phase1OAKDCamera()
-        print("✓ Camera initialized")
-        
         # Try to get a frame
         frame = camera.get_frame()
         if frame is not None:
             print(f"✓ Got frame: {frame.shape}")
         else:
             print("⚠ No frame available (camera may not be connected)")
-        
+    finally:
         camera.release()
-        return True
-    except Exception as e:
-        print(f"✗ Camera test failed: {e}")
-        return False
 
 
 def test_person_detector():
     """Test person detector"""
     print("\nTesting person detector...")
-    try:
-        from phase1_demo import SimplePersonDetector
-        detector = SimplePersonDetector()
-        print("✓ Person detector initialized")
-        detector.release()
-        return True
-    except Exception as e:
-        print(f"✗ Person detector test failed: {e}")
-        return False
+    from phase1_demo import SimplePersonDetector
+    detector = SimplePersonDetector()
+    print("✓ Person detector initialized")
+    detector.release()
 
 
 def test_rps_game():
     """Test RPS game"""
     print("\nTesting RPS game...")
+    from phase1_rps_game import Phase1RPSGame
+    # Try with model first, fallback to MediaPipe
     try:
-        from phase1_rps_game import Phase1RPSGame
-        # Try with model first, fallback to MediaPipe
-        try:
-            game = Phase1RPSGame(use_model=True)
-            print("✓ RPS game initialized (with model)")
-        except:
-            game = Phase1RPSGame(use_model=False)
-            print("✓ RPS game initialized (MediaPipe fallback)")
+        game = Phase1RPSGame(use_model=True)
+        print("✓ RPS game initialized (with model)")
+    except:
+        game = Phase1RPSGame(use_model=False)
+        print("✓ RPS game initialized (MediaPipe fallback)")
+    
+    game.release()
+
+
+def run_test(name, test):
+    """
+    Run one test for the script runner
+    
+    Args:
+        name: Name shown in failure messages
+        test: Test function (raises on failure)
         
-        game.release()
+    Returns:
+        bool: True if the test passed
+    """
+    try:
+        test()
         return True
     except Exception as e:
-        print(f"✗ RPS game test failed: {e}")
+        print(f"✗ {name} test failed: {e}")
         return False
 
 
@@ -155,16 +136,16 @@ def main():
     results = []
     
     # Test imports
-    results.append(("Imports", test_imports()))
+    results.append(("Imports", run_test("Imports", test_imports)))
     
     # Test camera
-    results.append(("Camera", test_camera()))
+    results.append(("Camera", run_test("Camera", test_camera)))
     
     # Test person detector
-    results.append(("Person Detector", test_person_detector()))
+    results.append(("Person Detector", run_test("Person Detector", test_person_detector)))
     
     # Test RPS game
-    results.append(("RPS Game", test_rps_game()))
+    results.append(("RPS Game", run_test("RPS Game", test_rps_game)))
     
     # Summary
     print("\n" + "=" * 60)
@@ -2,9 +2,36 @@
 Car Control Interface for Raspberry Pi with DonkeyCar and VESC
 Provides velocity control: set_velocity(linear, angular)
 """
-import time
 import os
+import re
+import time
+import glob
+import contextlib
 import inspect
+import queue
+import threading
+
+# pyserial is optional; used to pick the VESC out of the serial ports by USB ID
+try:
+    from serial.tools import list_ports
+    LIST_PORTS_AVAILABLE = True
+except ImportError:
+    LIST_PORTS_AVAILABLE = False
+
+# USB ID of the VESC's virtual COM port (STMicroelectronics)
+VESC_USB_VID = 0x0483
+VESC_USB_PID = 0x5740
+
+
+def _port_number(path):
+    """Trailing number of a serial device path ('/dev/ttyACM1' -> 1), or 0"""
+    match = re.search(r'(\d+)$', path)
+    return int(match.group(1)) if match else 0
+
+
+def _clip(value, lo, hi):
+    """Clamp value to [lo, hi] with comparisons only (no min/max calls)"""
+    return lo if value < lo else (hi if value > hi else value)
 
 
 class CarController:
@@ -12,6 +39,13 @@ class CarController:
     Car control interface for Raspberry Pi
     Supports VESC control via DonkeyCar or direct serial
     """
+    # VESC.run positional arg count per VESC class (signature parsing is slow)
+    _RUN_ARG_CACHE = {}
+    # Last auto-detected port as (time.monotonic(), port), reused for a few
+    # seconds so back-to-back reconnects share one scan
+    _PORT_CACHE = None
+    PORT_CACHE_TTL = 5.0
+    
     def __init__(
         self,
         vesc_port=None,
@@ -43,13 +77,27 @@ class CarController:
             vesc_duty_percent: Duty cycle cap passed into DonkeyCar VESC (default 0.4 = 40%)
         """
         self.vesc_port = vesc_port
+        # True if vesc_port came from _find_vesc_port; a reconnect then
+        # rescans in case the VESC re-enumerated (e.g. as ttyACM1)
+        self._port_auto_detected = vesc_port is None
         self.use_donkeycar = use_donkeycar
         self.simulation_mode = simulation_mode
         self.vesc = None
         self._vesc_run_args = 0  # Number of args the VESC.run method expects
+        self._vesc_apply = None  # (servo, throttle) -> None, bound in _init_vesc
         self._last_command_log = 0.0
+        # Last command passed to set_velocity and when it was applied
+        self._last_cmd = None
+        self._last_write = 0.0
         self._last_error_log = 0.0
         self._vesc_error_count = 0
+        # Serial writes happen on a worker thread; the slot holds only the
+        # newest (servo, throttle) so a slow port never backs up commands
+        self._cmd_q = queue.Queue(maxsize=1)
+        self._vesc_thread = None
+        # Write errors raised on the worker; set_velocity handles them on the
+        # control thread, so reconnects never race with it
+        self._worker_errors = queue.SimpleQueue()
         self.steering_inverted = steering_inverted
         self.steering_offset = steering_offset
         self.steering_scale = steering_scale
@@ -68,6 +116,11 @@ class CarController:
         self.max_linear_speed = 1.0  # m/s
         self.max_angular_speed = 2.0  # rad/s
         
+        # Derived constants for set_velocity (multiply instead of divide per call)
+        self._half_wheelbase = self.wheelbase * 0.5
+        self._inv_max_linear = 1.0 / self.max_linear_speed
+        self._inv_max_angular = 1.0 / self.max_angular_speed
+        
         if simulation_mode:
             print("[CarController] Running in SIMULATION mode (commands will be printed)")
         else:
@@ -81,18 +134,9 @@ class CarController:
         
         # Try to find VESC port if not provided
         if self.vesc_port is None:
-            possible_ports = [
-                '/dev/ttyACM0',
-                '/dev/ttyUSB0',
-                '/dev/ttyACM1',
-                '/dev/ttyUSB1',
-            ]
-            
-            for port in possible_ports:
-                if os.path.exists(port):
-                    self.vesc_port = port
-                    print(f"[CarController] Found potential VESC port: {port}")
-                    break
+            self.vesc_port = self._find_vesc_port()
+            if self.vesc_port is not None:
+                print(f"[CarController] Found potential VESC port: {self.vesc_port}")
         
         if self.vesc_port is None:
             print("[CarController] WARNING: VESC port not found. Running in simulation mode.")
@@ -110,8 +154,11 @@ class CarController:
                     percent=self.vesc_duty_percent,
                 )
                 self._vesc_run_args = self._introspect_vesc_run(self.vesc)
+                self._vesc_apply = self._bind_vesc_apply(self.vesc, self._vesc_run_args)
                 print(f"[CarController] VESC initialized via DonkeyCar on {self.vesc_port} (run args: {self._vesc_run_args})")
                 self.simulation_mode = False
+                self._enable_low_latency()
+                self._start_vesc_worker()
             except ImportError:
                 print("[CarController] WARNING: DonkeyCar not available. Install with: pip install donkeycar")
                 print("[CarController] Falling back to simulation mode")
@@ -126,18 +173,174 @@ class CarController:
             print("[CarController] Falling back to simulation mode")
             self.simulation_mode = True
 
+    @classmethod
+    def _find_vesc_port(cls):
+        """
+        Auto-detect the VESC serial port
+        
+        Prefers a port with the VESC's USB ID (needs pyserial), otherwise the
+        first /dev/ttyACM* or /dev/ttyUSB* port.
+        
+        Returns:
+            str: Port path, or None if no candidate was found
+        """
+        now = time.monotonic()
+        if (cls._PORT_CACHE is not None and now - cls._PORT_CACHE[0] < cls.PORT_CACHE_TTL
+                and os.path.exists(cls._PORT_CACHE[1])):
+            return cls._PORT_CACHE[1]
+        
+        port = None
+        if LIST_PORTS_AVAILABLE:
+            try:
+                vesc_ports = sorted(p.device for p in list_ports.comports()
+                                    if p.vid == VESC_USB_VID and p.pid == VESC_USB_PID)
+                if vesc_ports:
+                    port = vesc_ports[0]
+            except Exception as e:
+                print(f"[CarController] WARNING: Could not list serial ports: {e}")
+        
+        if port is None:
+            # One listing of /dev instead of probing fixed names; lowest
+            # number first, ttyACM before ttyUSB (ACM0, USB0, ACM1, ...)
+            possible_ports = sorted(
+                glob.glob('/dev/ttyACM*') + glob.glob('/dev/ttyUSB*'),
+                key=lambda path: (_port_number(path), 'USB' in path)
+            )
+            if possible_ports:
+                port = possible_ports[0]
+        
+        # Not found is not cached, so the next attempt scans again
+        if port is not None:
+            cls._PORT_CACHE = (now, port)
+        return port
+    
+    def _enable_low_latency(self):
+        """
+        Best effort: drop the USB-serial latency timer (16 ms by default on
+        FTDI-style adapters) so short VESC packets are not held back.
+        cdc-acm ports (/dev/ttyACM*) have no such timer and are left alone.
+        """
+        # DonkeyCar's VESC wraps pyvesc's VESC, which owns the serial.Serial
+        ser = getattr(getattr(self.vesc, "v", None), "serial_port", None)
+        if ser is not None and hasattr(ser, "set_low_latency_mode"):
+            try:
+                ser.set_low_latency_mode(True)
+                print("[CarController] Serial low-latency mode enabled")
+                return
+            except (OSError, ValueError):
+                pass
+        
+        # Fallback for usb-serial drivers: the sysfs latency timer (needs write access)
+        name = os.path.basename(os.path.realpath(self.vesc_port))
+        timer = f"/sys/bus/usb-serial/devices/{name}/latency_timer"
+        if os.path.exists(timer):
+            try:
+                with open(timer, "w") as f:
+                    f.write("1")
+                print(f"[CarController] Set {timer} to 1 ms")
+            except OSError as e:
+                print(f"[CarController] WARNING: Could not set serial latency timer: {e}")
+    
     def _introspect_vesc_run(self, vesc):
         """
         Determine how many positional args the VESC.run method accepts.
         This varies slightly across DonkeyCar versions.
         """
+        vesc_type = type(vesc)
+        cached = CarController._RUN_ARG_CACHE.get(vesc_type)
+        if cached is not None:
+            return cached
         try:
             sig = inspect.signature(vesc.run)
-            return len(sig.parameters)
+            n_args = len(sig.parameters)
+            CarController._RUN_ARG_CACHE[vesc_type] = n_args
+            return n_args
         except Exception as e:
             print(f"[CarController] WARNING: Could not inspect VESC.run signature: {e}")
             return 0
     
+    def _start_vesc_worker(self):
+        """Start the VESC write thread (once; a reconnect reuses it)"""
+        if self._vesc_thread is not None:
+            return
+        self._vesc_thread = threading.Thread(target=self._vesc_worker, daemon=True)
+        self._vesc_thread.start()
+    
+    def _stop_vesc_worker(self):
+        """Let the worker write any pending command, then stop it"""
+        if self._vesc_thread is None:
+            return
+        try:
+            # Blocking put: waits for the pending command to be taken, never drops it
+            self._cmd_q.put(None, timeout=1.0)
+            self._vesc_thread.join(timeout=1.0)
+        except queue.Full:
+            pass
+        if self._vesc_thread.is_alive():
+            print("[CarController] WARNING: VESC worker did not stop in time")
+        self._vesc_thread = None
+    
+    def _vesc_worker(self):
+        """Write queued commands to the VESC until a None sentinel arrives"""
+        while True:
+            cmd = self._cmd_q.get()
+            if cmd is None:
+                return
+            try:
+                self._vesc_apply(*cmd)
+            except Exception as e:
+                # Only record it; set_velocity reconnects on the control thread
+                self._worker_errors.put(e)
+    
+    def _submit_command(self, servo_cmd, throttle):
+        """Hand a command to the worker, replacing one it has not taken yet"""
+        cmd = (servo_cmd, throttle)
+        try:
+            self._cmd_q.put_nowait(cmd)
+        except queue.Full:
+            try:
+                self._cmd_q.get_nowait()
+            except queue.Empty:
+                pass
+            self._cmd_q.put_nowait(cmd)
+    
+    @staticmethod
+    def _bind_vesc_apply(vesc, run_args):
+        """
+        Pick how to send a command to this VESC once, instead of per command
+        
+        Args:
+            vesc: VESC instance
+            run_args: Positional arg count of vesc.run (see _introspect_vesc_run)
+        
+        Returns:
+            callable: apply(servo_cmd, throttle), blocking serial I/O
+        """
+        set_steering = getattr(vesc, "set_steering", None)
+        
+        # DonkeyCar's VESC API expects (angle, throttle)
+        if run_args >= 2:
+            return vesc.run
+        
+        if run_args == 1:
+            # Some older donkeycar versions only take throttle; set steering separately
+            run = vesc.run
+            if set_steering is None:
+                return lambda servo_cmd, throttle: run(throttle)
+            def apply(servo_cmd, throttle):
+                run(throttle)
+                set_steering(servo_cmd)
+            return apply
+        
+        # Fallback to common alt methods if signature introspection failed
+        set_throttle = getattr(vesc, "set_throttle", None)
+        def apply(servo_cmd, throttle):
+            if set_throttle is not None:
+                set_throttle(throttle)
+            if set_steering is not None:
+                set_steering(servo_cmd)
+        return apply
+    
     def set_velocity(self, linear, angular):
         """
         Set car velocity using linear and angular speeds
@@ -146,27 +349,47 @@ class CarController:
             linear: Linear velocity in m/s (forward positive, backward negative)
             angular: Angular velocity in rad/s (counterclockwise positive, clockwise negative)
         """
+        # Errors from the VESC worker since the last call
+        error = None
+        while True:
+            try:
+                error = self._worker_errors.get_nowait()
+            except queue.Empty:
+                break
+        if error is not None:
+            print(f"[CarController] Error setting motor speeds: {error}")
+            self._handle_vesc_error(error)
+        
+        # The same command again within 10 ms changes nothing; skip the
+        # conversion and the serial write
+        now = time.monotonic()
+        cmd = (linear, angular)
+        if cmd == self._last_cmd and now - self._last_write < 0.01:
+            return
+        self._last_cmd = cmd
+        self._last_write = now
+        
         # Clamp to max speeds
-        linear = max(-self.max_linear_speed, min(self.max_linear_speed, linear))
-        angular = max(-self.max_angular_speed, min(self.max_angular_speed, angular))
+        linear = _clip(linear, -self.max_linear_speed, self.max_linear_speed)
+        angular = _clip(angular, -self.max_angular_speed, self.max_angular_speed)
         
         self.current_linear = linear
         self.current_angular = angular
 
         # Convert to normalized throttle/steering for VESC (DonkeyCar expects -1..1)
-        throttle = max(-1.0, min(1.0, linear / self.max_linear_speed))
-        throttle = max(-1.0, min(1.0, throttle * self.throttle_scale))
-        steering = max(-1.0, min(1.0, angular / self.max_angular_speed))
+        # linear is already within +-max, so one clamp covers the scaled throttle
+        throttle = _clip(linear * self._inv_max_linear * self.throttle_scale, -1.0, 1.0)
+        steering = _clip(angular * self._inv_max_angular, -1.0, 1.0)
 
         # Apply steering calibration
         if self.steering_inverted:
             steering = -steering
         steering = steering * self.steering_scale + self.steering_offset
-        steering = max(-1.0, min(1.0, steering))
+        steering = _clip(steering, -1.0, 1.0)
 
         # Map normalized steering to servo pulse range (0..1)
         servo_cmd = self.servo_center + steering * self.servo_range
-        servo_cmd = max(0.0, min(1.0, servo_cmd))
+        servo_cmd = _clip(servo_cmd, 0.0, 1.0)
         
         if self.simulation_mode or self.vesc is None:
             # Print command for debugging when not actually driving hardware
@@ -186,26 +409,17 @@ class CarController:
             return
 
         # Convert linear/angular to left/right motor speeds (for logging only)
-        left_speed = linear - angular * self.wheelbase / 2.0
-        right_speed = linear + angular * self.wheelbase / 2.0
+        left_speed = linear - angular * self._half_wheelbase
+        right_speed = linear + angular * self._half_wheelbase
 
         try:
-            # DonkeyCar's VESC API expects (angle, throttle)
-            if self._vesc_run_args >= 2:
-                self.vesc.run(servo_cmd, throttle)
-            elif self._vesc_run_args == 1:
-                # Some older donkeycar versions only take throttle; try to set steering separately
-                self.vesc.run(throttle)
-                if hasattr(self.vesc, "set_steering"):
-                    self.vesc.set_steering(servo_cmd)
+            if self._vesc_thread is not None:
+                # Non-blocking: the worker does the serial write
+                self._submit_command(servo_cmd, throttle)
             else:
-                # Fallback to common alt methods if signature introspection failed
-                if hasattr(self.vesc, "set_throttle"):
-                    self.vesc.set_throttle(throttle)
-                if hasattr(self.vesc, "set_steering"):
-                    self.vesc.set_steering(servo_cmd)
+                self._vesc_apply(servo_cmd, throttle)
 
-            now = time.time()
+            # Rate-limited log (monotonic: unaffected by wall-clock changes)
             if now - self._last_command_log > 1.0:
                 print(f"[VESC] throttle={throttle:.2f}, steering(norm)={steering:.2f}, servo={servo_cmd:.2f} | left={left_speed:.2f} m/s, right={right_speed:.2f} m/s")
                 self._last_command_log = now
@@ -224,7 +438,7 @@ class CarController:
 
     def _handle_vesc_error(self, error):
         """Handle VESC communication errors with limited logging and optional reinit"""
-        now = time.time()
+        now = time.monotonic()
         if now - self._last_error_log > 1.0:
             print(f"[CarController] Keeping current mode; please check VESC connection. ({error})")
             self._last_error_log = now
@@ -234,12 +448,16 @@ class CarController:
         if self._vesc_error_count == 1:
             try:
                 print("[CarController] Attempting VESC reconnect...")
+                if self._port_auto_detected:
+                    self.vesc_port = None
                 self._init_vesc()
                 # If re-init succeeds, clear error count
                 if not self.simulation_mode and self.vesc is not None:
                     print("[CarController] VESC reconnected.")
                     self._vesc_error_count = 0
-            except Exception as e:
+            except OSError as e:
+                # Port errors only (pyserial's SerialException is an OSError);
+                # _init_vesc handles VESC construction failures itself
                 print(f"[CarController] VESC reconnect failed: {e}")
 
     
@@ -259,11 +477,12 @@ class CarController:
     def release(self):
         """Release car controller resources"""
         self.stop()
+        self._stop_vesc_worker()
         if self.vesc is not None:
-            # Clean up VESC connection if needed
-            try:
-                # VESC cleanup code here
-                pass
-            except:
-                pass
+            # DonkeyCar parts may provide shutdown(); a dead port must not
+            # stop release() from finishing
+            shutdown = getattr(self.vesc, "shutdown", None)
+            if shutdown is not None:
+                with contextlib.suppress(Exception):
+                    shutdown()
         print("[CarController] Released")
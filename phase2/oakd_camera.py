@@ -6,6 +6,7 @@ Designed for Raspberry Pi 5 with X11 forwarding
 import cv2
 import numpy as np
 import time
+from datetime import timedelta
 
 # Try to import depthai
 try:
@@ -22,6 +23,58 @@ try:
 except ImportError:
     MEDIAPIPE_AVAILABLE = False
 
+# Numba is optional; it compiles the MobileNet-SSD output scan
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+
+if NUMBA_AVAILABLE:
+    @njit(cache=True)
+    def _best_ssd_detection(data, label, conf_threshold):
+        """
+        Most confident detection of one class in raw MobileNet-SSD output
+        
+        Args:
+            data: Flat float32 array of 7-value records
+                [image_id, label, confidence, x_min, y_min, x_max, y_max]
+            label: Class id to look for
+            conf_threshold: Minimum confidence (exclusive)
+            
+        Returns:
+            int: Offset of the record in data, or -1 if there is none
+        """
+        best = -1
+        best_conf = conf_threshold
+        for i in range(0, (data.size // 7) * 7, 7):
+            if data[i + 1] == label and data[i + 2] > best_conf:
+                best = i
+                best_conf = data[i + 2]
+        return best
+else:
+    def _best_ssd_detection(data, label, conf_threshold):
+        """
+        Most confident detection of one class in raw MobileNet-SSD output
+        
+        Args:
+            data: Flat float32 array of 7-value records
+                [image_id, label, confidence, x_min, y_min, x_max, y_max]
+            label: Class id to look for
+            conf_threshold: Minimum confidence (exclusive)
+            
+        Returns:
+            int: Offset of the record in data, or -1 if there is none
+        """
+        n = data.size // 7
+        if n == 0:
+            return -1
+        records = data[:n * 7].reshape(n, 7)
+        scores = np.where(records[:, 1] == label, records[:, 2], 0)
+        i = int(scores.argmax())
+        return i * 7 if scores[i] > conf_threshold else -1
+
 
 class OAKDCamera:
     """
@@ -63,6 +116,10 @@ class OAKDCamera:
         self._restart_in_progress = False
         self.allow_fallback = allow_fallback
         self.using_depthai_nn = False
+        # Rendered bbox labels, text -> (color tile, uint8 mask); see _draw_label
+        self._label_cache = {}
+        # RGB copy of the frame for MediaPipe, reused across frames
+        self._rgb_buf = None
         # Default to USB2 for stability; fast_mode can override at init time if desired
         self.usb2_mode = usb2_mode
         self.fast_mode = fast_mode
@@ -148,6 +205,9 @@ class OAKDCamera:
                 raise
             
             # Set confidence threshold (only for MobileNetDetectionNetwork)
+            if not use_mobilenet_node:
+                # Compile the raw-output scan now rather than on the first result
+                _best_ssd_detection(np.zeros(7, dtype=np.float32), 15.0, 0.5)
             if use_mobilenet_node:
                 # Slightly lower threshold to improve recall in low light
                 self.detection_nn.setConfidenceThreshold(0.35)
@@ -292,10 +352,14 @@ class OAKDCamera:
             self._restart_in_progress = False
             return False
     
-    def get_frame(self):
+    def get_frame(self, timeout_ms=50):
         """
         Get a frame from the camera
         
+        Args:
+            timeout_ms: How long to wait for the OAKD to deliver a frame
+                (one frame period at 20 FPS); 0 returns immediately
+        
         Returns:
             numpy.ndarray: BGR frame, or None if no frame available
         """
@@ -308,7 +372,16 @@ class OAKDCamera:
         if not self.available or self.rgb_queue is None:
             return None
         
-        in_rgb = self.rgb_queue.tryGet()
+        if timeout_ms:
+            # Sleep in DepthAI until a frame arrives instead of polling
+            in_rgb = self.rgb_queue.get(timeout=timedelta(milliseconds=timeout_ms))
+            if isinstance(in_rgb, tuple):
+                # DepthAI returns (message, timed_out) when a timeout is given
+                in_rgb, timed_out = in_rgb
+                if timed_out:
+                    in_rgb = None
+        else:
+            in_rgb = self.rgb_queue.tryGet()
         if in_rgb is not None:
             frame = in_rgb.getCvFrame()
             return frame
@@ -376,7 +449,6 @@ class OAKDCamera:
         if frame is None:
             return False, None, None
         
-        annotated_frame = frame.copy()
         person_found = False
         person_bbox = None
         conf_threshold = 0.35
@@ -387,7 +459,11 @@ class OAKDCamera:
         
         # Use DepthAI detection network
         if self.nn_queue is None:
-            return False, None, annotated_frame
+            return False, None, frame
+        
+        # Copied only when there is a box to draw; most frames have no new
+        # NN result and are returned as-is
+        annotated_frame = frame
         
         # Get detection results
         in_nn = self.nn_queue.tryGet()
@@ -403,88 +479,84 @@ class OAKDCamera:
                 # Try to get as NeuralNetwork output (tensor format)
                 try:
                     detection_data = in_nn.getLayerFp16("DetectionOutput")
-                    detections = self._parse_neural_network_output(detection_data)
+                    detections = np.asarray(detection_data, dtype=np.float32).ravel()
                     detection_format = "tensor"
                 except:
                     detections = []
                     detection_format = "unknown"
             
-            # Find person detections (class 15 in COCO dataset)
-            for detection in detections:
-                # Handle different detection formats
-                if detection_format == "mobilenet":
-                    label = detection.label
-                    confidence = detection.confidence
-                    xmin = detection.xmin
-                    ymin = detection.ymin
-                    xmax = detection.xmax
-                    ymax = detection.ymax
-                elif detection_format == "tensor":
-                    label = int(detection[1])
-                    confidence = detection[2]
-                    xmin = detection[3]
-                    ymin = detection[4]
-                    xmax = detection[5]
-                    ymax = detection[6]
-                else:
-                    continue
+            # Find the person detection (class 15) as
+            # (confidence, xmin, ymin, xmax, ymax), coordinates normalized (0-1)
+            person = None
+            if detection_format == "mobilenet":
+                for detection in detections:
+                    if detection.label == 15 and detection.confidence > conf_threshold:
+                        # Only take the first (most confident) person detection
+                        person = (detection.confidence, detection.xmin, detection.ymin,
+                                  detection.xmax, detection.ymax)
+                        break
+            elif detection_format == "tensor":
+                i = _best_ssd_detection(detections, 15.0, conf_threshold)
+                if i >= 0:
+                    person = detections[i + 2:i + 7].tolist()
+            
+            if person is not None:
+                confidence, xmin, ymin, xmax, ymax = person
+                person_found = True
+                
+                # Get bounding box coordinates
+                x_min = int(xmin * w)
+                y_min = int(ymin * h)
+                x_max = int(xmax * w)
+                y_max = int(ymax * h)
                 
-                if label == 15 and confidence > conf_threshold:  # Person class
-                    person_found = True
-                    
-                    # Get bounding box coordinates
-                    # Detection coordinates are normalized (0-1)
-                    x_min = int(xmin * w)
-                    y_min = int(ymin * h)
-                    x_max = int(xmax * w)
-                    y_max = int(ymax * h)
-                    
-                    # Clamp to frame bounds
-                    x_min = max(0, min(w - 1, x_min))
-                    y_min = max(0, min(h - 1, y_min))
-                    x_max = max(0, min(w - 1, x_max))
-                    y_max = max(0, min(h - 1, y_max))
-                    
-                    person_bbox = (x_min, y_min, x_max, y_max)
-                    
-                    # Draw bounding box
-                    cv2.rectangle(annotated_frame, (x_min, y_min), (x_max, y_max), (0, 255, 0), 2)
-                    
-                    # Draw label
-                    label_text = f"Person {confidence:.2f}"
-                    cv2.putText(annotated_frame, label_text, (x_min, y_min - 10),
-                               cv2.FONT_HERSHEY_SIMPLEX, 0.6, (0, 255, 0), 2)
-                    
-                    # Only take the first (most confident) person detection
-                    break
+                # Clamp to frame bounds
+                x_min = max(0, min(w - 1, x_min))
+                y_min = max(0, min(h - 1, y_min))
+                x_max = max(0, min(w - 1, x_max))
+                y_max = max(0, min(h - 1, y_max))
+                
+                person_bbox = (x_min, y_min, x_max, y_max)
+                
+                # Draw bounding box
+                annotated_frame = frame.copy()
+                cv2.rectangle(annotated_frame, (x_min, y_min), (x_max, y_max), (0, 255, 0), 2)
+                
+                # Draw label
+                self._draw_label(annotated_frame, f"Person {confidence:.2f}", x_min, y_min - 10)
         
         return person_found, person_bbox, annotated_frame
     
     def _detect_person_mediapipe(self, frame):
         """Detect person using MediaPipe Pose"""
-        annotated_frame = frame.copy()
+        annotated_frame = frame  # copied below only if a box is drawn
         person_found = False
         person_bbox = None
         
         if self.mediapipe_pose is None:
-            return False, None, annotated_frame
+            return False, None, frame
         
-        # Convert BGR to RGB for MediaPipe
-        rgb_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-        results = self.mediapipe_pose.process(rgb_frame)
+        # Convert BGR to RGB for MediaPipe (process() copies its input, so
+        # the buffer can be overwritten next frame)
+        if self._rgb_buf is None or self._rgb_buf.shape != frame.shape:
+            self._rgb_buf = np.empty_like(frame)
+        cv2.cvtColor(frame, cv2.COLOR_BGR2RGB, dst=self._rgb_buf)
+        results = self.mediapipe_pose.process(self._rgb_buf)
         
         if results.pose_landmarks:
             # Get bounding box from pose landmarks
             h, w = frame.shape[:2]
             landmarks = results.pose_landmarks.landmark
             
-            x_coords = [lm.x * w for lm in landmarks]
-            y_coords = [lm.y * h for lm in landmarks]
+            # Reduce the normalized coordinates and scale only the four
+            # extremes (scaling is monotonic, so min/max are unchanged)
+            x_coords = [lm.x for lm in landmarks]
+            y_coords = [lm.y for lm in landmarks]
             
-            x_min = int(min(x_coords))
-            x_max = int(max(x_coords))
-            y_min = int(min(y_coords))
-            y_max = int(max(y_coords))
+            x_min = int(min(x_coords) * w)
+            x_max = int(max(x_coords) * w)
+            y_min = int(min(y_coords) * h)
+            y_max = int(max(y_coords) * h)
             
             # Add padding
             padding = 20
@@ -497,33 +569,45 @@ class OAKDCamera:
             person_found = True
             
             # Draw bounding box
+            annotated_frame = frame.copy()
             cv2.rectangle(annotated_frame, (x_min, y_min), (x_max, y_max), (0, 255, 0), 2)
-            cv2.putText(annotated_frame, "Person (MediaPipe)", (x_min, y_min - 10),
-                       cv2.FONT_HERSHEY_SIMPLEX, 0.6, (0, 255, 0), 2)
+            self._draw_label(annotated_frame, "Person (MediaPipe)", x_min, y_min - 10)
         
         return person_found, person_bbox, annotated_frame
     
-    def _parse_neural_network_output(self, detection_data):
-        """
-        Parse NeuralNetwork output tensor into detection format
-        MobileNet-SSD output: [batch, num_detections, 7]
-        Each detection: [image_id, label, confidence, x_min, y_min, x_max, y_max]
+    def _draw_label(self, image, text, x, y):
         """
-        detections = []
-        if detection_data is None or len(detection_data) == 0:
-            return detections
+        Draw a green bbox label in place, as cv2.putText would
         
-        # Reshape to [num_detections, 7]
-        num_detections = len(detection_data) // 7
-        for i in range(num_detections):
-            idx = i * 7
-            if idx + 6 < len(detection_data):
-                detection = detection_data[idx:idx+7]
-                # Filter out invalid detections (confidence = -1 means no detection)
-                if detection[2] > 0:
-                    detections.append(detection)
+        Labels repeat from frame to frame ("Person 0.00".."Person 1.00"), so
+        each one is rasterized once and then copied through its mask.
+        
+        Args:
+            image: BGR image to draw on
+            text: Label text
+            x, y: Bottom-left corner of the text (putText origin)
+        """
+        label = self._label_cache.get(text)
+        if label is None:
+            font, scale, thickness, pad = cv2.FONT_HERSHEY_SIMPLEX, 0.6, 2, 4
+            (tw, th), baseline = cv2.getTextSize(text, font, scale, thickness)
+            mask = np.zeros((th + baseline + 2 * pad, tw + 2 * pad), dtype=np.uint8)
+            cv2.putText(mask, text, (pad, pad + th), font, scale, 255, thickness)
+            tile = np.empty(mask.shape + (3,), dtype=np.uint8)
+            tile[:] = (0, 255, 0)
+            label = self._label_cache[text] = (tile, mask, pad + th, pad)
+        tile, mask, dy, dx = label
         
-        return detections
+        # Clip the label rectangle to the image, as putText does
+        img_h, img_w = image.shape[:2]
+        y0, x0 = y - dy, x - dx
+        y1, x1 = y0 + mask.shape[0], x0 + mask.shape[1]
+        cy0, cx0 = max(y0, 0), max(x0, 0)
+        cy1, cx1 = min(y1, img_h), min(x1, img_w)
+        if cy0 >= cy1 or cx0 >= cx1:
+            return
+        sy, sx = slice(cy0 - y0, cy1 - y0), slice(cx0 - x0, cx1 - x0)
+        cv2.copyTo(tile[sy, sx], mask[sy, sx], image[cy0:cy1, cx0:cx1])
     
     def _is_depthai_device_connected(self):
         """Check if an OAKD/DepthAI device is connected"""
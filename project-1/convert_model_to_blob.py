@@ -9,6 +9,51 @@ import subprocess
 import sys
 
 
+def quantize_onnx_model(onnx_path, output_path=None):
+    """
+    Quantize an ONNX model's weights to INT8 for faster CPU inference
+    
+    Args:
+        onnx_path: Path to FP32 .onnx model
+        output_path: Output path (optional, defaults to <name>_int8.onnx)
+    
+    Returns:
+        str: Path to quantized model, or None if onnxruntime is not installed
+             or the quantized model does not run
+    """
+    try:
+        import numpy as np
+        import onnxruntime as ort
+        from onnxruntime.quantization import quantize_dynamic, QuantType
+    except ImportError:
+        print("onnxruntime not installed, skipping INT8 quantization")
+        print("Install with: pip install onnxruntime")
+        return None
+    
+    if output_path is None:
+        output_path = os.path.splitext(onnx_path)[0] + '_int8.onnx'
+    
+    print(f"Quantizing to INT8: {output_path}")
+    # QUInt8: the CPU provider only implements ConvInteger for uint8 weights
+    quantize_dynamic(onnx_path, output_path, weight_type=QuantType.QUInt8)
+    
+    # Run the quantized model once so a broken file is never left next to
+    # the FP32 one (ModelGestureDetector prefers *_int8.onnx when present)
+    try:
+        session = ort.InferenceSession(output_path, providers=['CPUExecutionProvider'])
+        model_input = session.get_inputs()[0]
+        shape = [d if isinstance(d, int) else 1 for d in model_input.shape]
+        session.run(None, {model_input.name: np.zeros(shape, dtype=np.float32)})
+    except Exception as e:
+        print(f"Quantized model failed to run, discarding it: {e}")
+        os.remove(output_path)
+        return None
+    
+    print(f"INT8 model saved to: {output_path}")
+    
+    return output_path
+
+
 def convert_pytorch_to_blob(model_path, output_blob_path=None, input_size=(64, 64)):
     """
     Convert PyTorch model to OpenVINO blob format for OAKD
@@ -67,6 +112,12 @@ def convert_pytorch_to_blob(model_path, output_blob_path=None, input_size=(64, 6
     
     print(f"ONNX model saved to: {onnx_path}")
     
+    # INT8 copy for ONNX Runtime on the laptop (the blob below stays FP32)
+    try:
+        quantize_onnx_model(onnx_path)
+    except Exception as e:
+        print(f"INT8 quantization failed, continuing without it: {e}")
+    
     # Convert ONNX to OpenVINO IR (Intermediate Representation)
     print("Converting ONNX to OpenVINO IR...")
     print("Note: This requires OpenVINO toolkit installed")
@@ -18,15 +18,19 @@ class HandGestureDetectorModel:
     Uses MediaPipe to detect hand bounding box, then model for classification
     Compatible with the original HandGestureDetector interface
     """
-    def __init__(self, model_path=None):
+    def __init__(self, model_path=None, sess_options=None, providers=None):
         """
         Initialize model-based gesture detector
         
         Args:
             model_path: Path to model file (rps_model_improved.pth or rps_model.pth)
+            sess_options: Optional ONNX Runtime session options for the classifier
+            providers: Optional ONNX Runtime execution providers for the classifier
         """
         print("Initializing model-based gesture detector...")
-        self.model_detector = ModelGestureDetector(model_path=model_path)
+        self.model_detector = ModelGestureDetector(model_path=model_path,
+                                                   sess_options=sess_options,
+                                                   providers=providers)
         
         # Initialize MediaPipe for hand detection (bounding box)
         self.mp_hands = mp.solutions.hands
@@ -38,6 +42,9 @@ class HandGestureDetectorModel:
         )
         self.mp_drawing = mp.solutions.drawing_utils
         
+        # RGB conversion buffer, reallocated only if the frame shape changes
+        self._rgb_buf = None
+        
         print("Model-based detector ready!")
     
     def _get_hand_bbox(self, frame):
@@ -50,20 +57,21 @@ class HandGestureDetectorModel:
         Returns:
             tuple: (bbox, landmarks) where bbox is (x, y, w, h) or None
         """
-        rgb_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+        if self._rgb_buf is None or self._rgb_buf.shape != frame.shape:
+            self._rgb_buf = np.empty_like(frame)
+        rgb_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB, dst=self._rgb_buf)
         results = self.hands.process(rgb_frame)
         
         if results.multi_hand_landmarks:
             for hand_landmarks in results.multi_hand_landmarks:
-                # Get bounding box from landmarks
+                # Get bounding box from landmarks: one (N, 2) array of
+                # normalized (x, y), reduced in a single pass per axis
                 h, w = frame.shape[:2]
-                x_coords = [lm.x * w for lm in hand_landmarks.landmark]
-                y_coords = [lm.y * h for lm in hand_landmarks.landmark]
-                
-                x_min = int(min(x_coords))
-                x_max = int(max(x_coords))
-                y_min = int(min(y_coords))
-                y_max = int(max(y_coords))
+                lms = hand_landmarks.landmark
+                pts = np.fromiter((v for lm in lms for v in (lm.x, lm.y)),
+                                  dtype=np.float64, count=len(lms) * 2).reshape(-1, 2)
+                x_min, y_min = map(int, pts.min(axis=0) * (w, h))
+                x_max, y_max = map(int, pts.max(axis=0) * (w, h))
                 
                 # Add padding
                 padding = 20
@@ -90,27 +98,11 @@ class HandGestureDetectorModel:
                 - annotated_frame: Frame with detection info and bounding box
                 - bbox: Hand bounding box (x, y, w, h) or None
         """
-        annotated_frame = frame.copy()
-        
         # Get hand bounding box using MediaPipe
         bbox, landmarks = self._get_hand_bbox(frame)
         
-        # Draw bounding box if detected
-        if bbox is not None:
-            x, y, w, h = bbox
-            cv2.rectangle(annotated_frame, (x, y), (x+w, y+h), (0, 255, 0), 2)
-            cv2.putText(annotated_frame, "Hand", (x, y-10),
-                       cv2.FONT_HERSHEY_SIMPLEX, 0.6, (0, 255, 0), 2)
-        
-        # Draw hand landmarks if detected
-        if landmarks:
-            self.mp_drawing.draw_landmarks(
-                annotated_frame,
-                landmarks,
-                self.mp_hands.HAND_CONNECTIONS
-            )
-        
-        # Use model to classify gesture (with bounding box)
+        # Use model to classify gesture (with bounding box). The model
+        # detector draws the bbox and prediction onto its annotated frame.
         gesture, confidence, annotated_frame = self.model_detector.detect_gesture(
             frame, confidence_threshold=0.5, hand_bbox=bbox
         )
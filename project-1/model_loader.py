@@ -10,6 +10,13 @@ import numpy as np
 from enum import Enum
 import os
 
+# ONNX Runtime is optional; used when an exported .onnx model sits next to the .pth
+try:
+    import onnxruntime as ort
+    ORT_AVAILABLE = True
+except ImportError:
+    ORT_AVAILABLE = False
+
 
 class Gesture(Enum):
     ROCK = "rock"
@@ -68,8 +75,51 @@ class RPSModel(nn.Module):
         return x
 
 
+def create_session_options(intra_op_num_threads=None):
+    """
+    Build ONNX Runtime session options tuned for CPU inference
+    
+    Create these once and pass them to every detector so all sessions share
+    the same threading and graph optimization settings.
+    
+    Args:
+        intra_op_num_threads: Threads per operator, defaults to all CPUs
+    
+    Returns:
+        ort.SessionOptions, or None if onnxruntime is not installed
+    """
+    if not ORT_AVAILABLE:
+        return None
+    
+    opts = ort.SessionOptions()
+    opts.intra_op_num_threads = intra_op_num_threads or os.cpu_count() or 1
+    opts.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+    return opts
+
+
+def select_providers():
+    """
+    Pick ONNX Runtime execution providers for this machine
+    
+    Uses the CUDA provider on PyTorch's current device and stream when a GPU
+    is present and onnxruntime was built with CUDA, otherwise the CPU.
+    
+    Returns:
+        list: Providers for ort.InferenceSession
+    """
+    if (ORT_AVAILABLE and torch.cuda.is_available()
+            and "CUDAExecutionProvider" in ort.get_available_providers()):
+        cuda_options = {
+            "device_id": torch.cuda.current_device(),
+            "user_compute_stream": str(torch.cuda.current_stream().cuda_stream),
+        }
+        return [("CUDAExecutionProvider", cuda_options), "CPUExecutionProvider"]
+    return ["CPUExecutionProvider"]
+
+
 class ModelGestureDetector:
-    def __init__(self, model_path=None, device=None):
+    def __init__(self, model_path=None, device=None, sess_options=None, providers=None,
+                 quantize=True):
         """
         Initialize model-based gesture detector
         
@@ -77,6 +127,12 @@ class ModelGestureDetector:
             model_path: Path to trained model file (.pth)
                        If None, will look for rps_model_improved.pth or rps_model.pth
             device: PyTorch device ('cuda' or 'cpu'), auto-detects if None
+            sess_options: Optional ONNX Runtime session options (see
+                          create_session_options), used if an .onnx model exists
+            providers: Optional ONNX Runtime providers (see select_providers),
+                       auto-detects if None
+            quantize: Dynamically quantize the PyTorch model's Linear layers
+                      to int8 when running on the CPU
         """
         # Set device
         if device is None:
@@ -113,6 +169,69 @@ class ModelGestureDetector:
                 f"Or run: python download_model.py"
             )
         
+        # Class labels (order matters - must match training)
+        self.class_labels = [Gesture.ROCK, Gesture.PAPER, Gesture.SCISSORS]
+        
+        # Image preprocessing parameters (adjust based on training)
+        self.input_size = (64, 64)  # Common size for RPS models
+        
+        # Preprocessing buffers reused for every single-frame prediction
+        w, h = self.input_size
+        self._resize_buf = np.empty((h, w, 3), dtype=np.uint8)
+        self._rgb_buf = np.empty((h, w, 3), dtype=np.uint8)
+        self._input = np.empty((1, 3, h, w), dtype=np.float32)
+        self._input_tensor = None
+        
+        # Prefer the exported ONNX model through ONNX Runtime when available,
+        # INT8-quantized first
+        self.session = None
+        self.model = None
+        stem = os.path.splitext(model_path)[0]
+        for onnx_path in (stem + '_int8.onnx', stem + '.onnx'):
+            if not ORT_AVAILABLE or not os.path.exists(onnx_path):
+                continue
+            try:
+                self._load_onnx_model(onnx_path, sess_options, providers)
+                break
+            except Exception as e:
+                print(f"Failed to load ONNX model: {e}")
+                self.session = None
+        
+        if self.session is None:
+            self._load_torch_model(model_path, quantize)
+    
+    def _load_onnx_model(self, onnx_path, sess_options=None, providers=None):
+        """
+        Create the ONNX Runtime session and run one warm-up inference
+        
+        Args:
+            onnx_path: Path to the exported .onnx model
+            sess_options: Optional ort.SessionOptions
+            providers: Optional execution providers
+        """
+        print(f"Loading ONNX model from: {onnx_path}")
+        if sess_options is None:
+            sess_options = create_session_options()
+        if providers is None:
+            providers = select_providers()
+        self.session = ort.InferenceSession(onnx_path, sess_options=sess_options,
+                                            providers=providers)
+        print(f"ONNX Runtime providers: {self.session.get_providers()}")
+        self._input_name = self.session.get_inputs()[0].name
+        
+        # The first run pays for memory planning and kernel selection
+        w, h = self.input_size
+        self.session.run(None, {self._input_name: np.zeros((1, 3, h, w), dtype=np.float32)})
+        print("ONNX model loaded successfully!")
+    
+    def _load_torch_model(self, model_path, quantize=True):
+        """
+        Load the PyTorch model weights
+        
+        Args:
+            model_path: Path to trained model file (.pth)
+            quantize: Quantize the Linear layers to int8 on the CPU
+        """
         print(f"Loading model from: {model_path}")
         
         # Initialize model
@@ -155,11 +274,22 @@ class ModelGestureDetector:
         self.model.to(self.device)
         self.model.eval()
         
-        # Class labels (order matters - must match training)
-        self.class_labels = [Gesture.ROCK, Gesture.PAPER, Gesture.SCISSORS]
+        # int8 weights for the fully connected layers (fc1 alone holds most of
+        # the parameters). Dynamic quantization has no Conv2d kernels and only
+        # runs on the CPU, so the conv blocks stay float32.
+        if quantize and self.device.type == 'cpu':
+            try:
+                self.model = torch.quantization.quantize_dynamic(
+                    self.model, {nn.Linear}, dtype=torch.qint8)
+                print("Model quantized to int8 (Linear layers)")
+            except Exception as e:
+                print(f"Quantization skipped: {e}")
         
-        # Image preprocessing parameters (adjust based on training)
-        self.input_size = (64, 64)  # Common size for RPS models
+        # On the CPU torch.from_numpy already shares memory with self._input;
+        # on a GPU keep one device tensor and copy into it
+        if self.device.type != 'cpu':
+            self._input_tensor = torch.empty(self._input.shape, dtype=torch.float32,
+                                             device=self.device)
     
     def preprocess_image(self, frame, bbox=None):
         """
@@ -172,6 +302,22 @@ class ModelGestureDetector:
         Returns:
             Preprocessed tensor ready for model
         """
+        frame_array = self._preprocess_array(frame, bbox)
+        return torch.from_numpy(frame_array).to(self.device)
+    
+    def _preprocess_array(self, frame, bbox=None, out=None):
+        """
+        Preprocess image into a float32 NCHW array
+        
+        Args:
+            frame: BGR image frame
+            bbox: Optional bounding box (x, y, w, h) to crop hand region
+            out: Optional float32 array of shape (3, H, W) to write into,
+                 reusing the internal resize/colour buffers
+            
+        Returns:
+            np.ndarray: Shape (1, 3, H, W), values in [0, 1], or out if given
+        """
         # Crop to hand region if bbox provided
         if bbox is not None:
             x, y, w, h = bbox
@@ -183,6 +329,13 @@ class ModelGestureDetector:
             h = min(frame.shape[0] - y, h + 2 * padding)
             frame = frame[y:y+h, x:x+w]
         
+        if out is not None:
+            # Same steps as below, without allocating
+            cv2.resize(frame, self.input_size, dst=self._resize_buf)
+            cv2.cvtColor(self._resize_buf, cv2.COLOR_BGR2RGB, dst=self._rgb_buf)
+            np.divide(self._rgb_buf.transpose(2, 0, 1), np.float32(255.0), out=out)
+            return out
+        
         # Resize to model input size
         frame_resized = cv2.resize(frame, self.input_size)
         
@@ -192,11 +345,40 @@ class ModelGestureDetector:
         # Normalize to [0, 1]
         frame_normalized = frame_rgb.astype(np.float32) / 255.0
         
-        # Convert to tensor and add batch dimension
+        # Add batch dimension
         # Shape: (H, W, C) -> (C, H, W) -> (1, C, H, W)
-        frame_tensor = torch.from_numpy(frame_normalized).permute(2, 0, 1).unsqueeze(0)
+        return np.ascontiguousarray(frame_normalized.transpose(2, 0, 1)[np.newaxis])
+    
+    def _predict(self, frame, bbox=None):
+        """
+        Run the classifier on a frame
+        
+        Args:
+            frame: BGR image frame
+            bbox: Optional bounding box (x, y, w, h) to crop hand region
+            
+        Returns:
+            tuple: (confidence, predicted_idx)
+        """
+        self._preprocess_array(frame, bbox, out=self._input[0])
         
-        return frame_tensor.to(self.device)
+        if self.session is not None:
+            outputs = self.session.run(None, {self._input_name: self._input})[0][0]
+            # Softmax over the class logits
+            exp = np.exp(outputs - outputs.max())
+            probabilities = exp / exp.sum()
+            predicted_idx = int(probabilities.argmax())
+            return float(probabilities[predicted_idx]), predicted_idx
+        
+        inputs = torch.from_numpy(self._input)
+        if self._input_tensor is not None:
+            inputs = self._input_tensor.copy_(inputs)
+        
+        with torch.no_grad():
+            outputs = self.model(inputs)
+            probabilities = torch.nn.functional.softmax(outputs, dim=1)
+            confidence, predicted = torch.max(probabilities, 1)
+        return confidence.item(), predicted.item()
     
     def detect_gesture(self, frame, confidence_threshold=0.5, hand_bbox=None):
         """
@@ -211,42 +393,38 @@ class ModelGestureDetector:
             tuple: (gesture, confidence, annotated_frame)
                 - gesture: Gesture enum (ROCK, PAPER, SCISSORS, or NONE)
                 - confidence: Confidence score (0-1)
-                - annotated_frame: Frame with detection info
+                - annotated_frame: Frame with detection info (frame itself
+                  if there was nothing to draw)
         """
-        annotated_frame = frame.copy()
+        annotated_frame = frame
         
         try:
-            # Preprocess image (with bounding box if provided)
-            input_tensor = self.preprocess_image(frame, bbox=hand_bbox)
+            # Run inference (with bounding box if provided)
+            confidence, predicted_idx = self._predict(frame, hand_bbox)
             
-            # Run inference
-            with torch.no_grad():
-                outputs = self.model(input_tensor)
-                probabilities = torch.nn.functional.softmax(outputs, dim=1)
-                confidence, predicted = torch.max(probabilities, 1)
-                
-                confidence = confidence.item()
-                predicted_idx = predicted.item()
-                
-                # Check confidence threshold
-                if confidence >= confidence_threshold:
-                    gesture = self.class_labels[predicted_idx]
-                else:
-                    gesture = Gesture.NONE
-                    confidence = 0.0
-                
-                # Draw bounding box if provided
-                if hand_bbox is not None:
-                    x, y, w, h = hand_bbox
-                    cv2.rectangle(annotated_frame, (x, y), (x+w, y+h), (0, 255, 0), 2)
-                
-                # Draw prediction on frame
-                if gesture != Gesture.NONE:
-                    text = f"{gesture.value.upper()}: {confidence:.2f}"
-                    text_x = hand_bbox[0] if hand_bbox is not None else 10
-                    text_y = (hand_bbox[1] - 10) if hand_bbox is not None else 30
-                    cv2.putText(annotated_frame, text, (text_x, text_y),
-                               cv2.FONT_HERSHEY_SIMPLEX, 0.7, (0, 255, 0), 2)
+            # Check confidence threshold
+            if confidence >= confidence_threshold:
+                gesture = self.class_labels[predicted_idx]
+            else:
+                gesture = Gesture.NONE
+                confidence = 0.0
+            
+            # Copy only when there is something to draw
+            if hand_bbox is not None or gesture != Gesture.NONE:
+                annotated_frame = frame.copy()
+            
+            # Draw bounding box if provided
+            if hand_bbox is not None:
+                x, y, w, h = hand_bbox
+                cv2.rectangle(annotated_frame, (x, y), (x+w, y+h), (0, 255, 0), 2)
+            
+            # Draw prediction on frame
+            if gesture != Gesture.NONE:
+                text = f"{gesture.value.upper()}: {confidence:.2f}"
+                text_x = hand_bbox[0] if hand_bbox is not None else 10
+                text_y = (hand_bbox[1] - 10) if hand_bbox is not None else 30
+                cv2.putText(annotated_frame, text, (text_x, text_y),
+                           cv2.FONT_HERSHEY_SIMPLEX, 0.7, (0, 255, 0), 2)
         
         except Exception as e:
             print(f"Error in gesture detection: {e}")
@@ -20,9 +20,12 @@ class GameUI:
         self.screen_width = screen_width
         self.screen_height = screen_height
         self.display_frame = None
+        
+        # Rendered text sprites (result block, gesture names), keyed by their lines
+        self._sprite_cache = {}
     
     def create_display(self, camera_frame, player_gesture, ai_gesture, 
-                      game_result, player_score, ai_score, round_count):
+                      game_result, player_score, ai_score, round_count, canvas=None):
         """
         Create the game display frame
         
@@ -34,18 +37,28 @@ class GameUI:
             player_score: Player's score
             ai_score: AI's score
             round_count: Current round number
+            canvas: Optional preallocated (screen_height, screen_width, 3) uint8
+                    buffer to draw into instead of allocating a new frame
             
         Returns:
-            numpy.ndarray: Display frame ready to show
+            numpy.ndarray: Display frame ready to show (canvas, if given)
         """
-        # Create blank display
-        self.display_frame = np.zeros((self.screen_height, self.screen_width, 3), dtype=np.uint8)
-        self.display_frame.fill(30)  # Dark background
-        
         # Layout: Camera feed on left, game info on right
         camera_width = int(self.screen_width * 0.6)
         info_width = self.screen_width - camera_width
         
+        # Dark background; on a reused canvas only the parts the camera feed
+        # does not cover need clearing
+        if canvas is None:
+            self.display_frame = np.full((self.screen_height, self.screen_width, 3), 30,
+                                         dtype=np.uint8)
+        else:
+            self.display_frame = canvas
+            if camera_frame is None:
+                canvas.fill(30)
+            else:
+                canvas[:, camera_width:] = 30
+        
         # Resize and place camera frame
         if camera_frame is not None:
             camera_resized = cv2.resize(camera_frame, (camera_width, self.screen_height))
@@ -81,8 +94,7 @@ class GameUI:
         y_offset += 30
         player_text = player_gesture.value.upper() if player_gesture != Gesture.NONE else "WAITING..."
         player_color = (100, 255, 100) if player_gesture != Gesture.NONE else (150, 150, 150)
-        self._draw_text(player_text, info_x, y_offset, 
-                       font_scale=0.7, thickness=2, color=player_color)
+        self._draw_sprite(((player_text, (info_x, y_offset), 0.7, 2, player_color),))
         y_offset += 60
         
         # AI gesture
@@ -91,28 +103,12 @@ class GameUI:
         y_offset += 30
         ai_text = ai_gesture.value.upper() if ai_gesture != Gesture.NONE else "WAITING..."
         ai_color = (100, 100, 255) if ai_gesture != Gesture.NONE else (150, 150, 150)
-        self._draw_text(ai_text, info_x, y_offset, 
-                       font_scale=0.7, thickness=2, color=ai_color)
+        self._draw_sprite(((ai_text, (info_x, y_offset), 0.7, 2, ai_color),))
         y_offset += 60
         
         # Result
         if game_result:
-            self._draw_text("Result:", info_x, y_offset, 
-                           font_scale=0.5, color=(200, 200, 200))
-            y_offset += 30
-            
-            if game_result == GameResult.PLAYER_WINS:
-                result_text = "YOU WIN!"
-                result_color = (0, 255, 0)
-            elif game_result == GameResult.AI_WINS:
-                result_text = "DONKEY CAR WINS!"
-                result_color = (0, 100, 255)
-            else:
-                result_text = "TIE!"
-                result_color = (255, 255, 0)
-            
-            self._draw_text(result_text, info_x, y_offset, 
-                           font_scale=0.8, thickness=2, color=result_color)
+            self._draw_result(game_result, info_x, y_offset)
         
         # Instructions at bottom
         y_offset = self.screen_height - 80
@@ -124,6 +120,80 @@ class GameUI:
         
         return self.display_frame
     
+    def _draw_result(self, game_result, x, y):
+        """
+        Draw the "Result:" label and the result text starting at (x, y)
+        
+        Args:
+            game_result: GameResult enum
+            x: X coordinate
+            y: Y coordinate of the "Result:" label
+        """
+        if game_result == GameResult.PLAYER_WINS:
+            result_text = "YOU WIN!"
+            result_color = (0, 255, 0)
+        elif game_result == GameResult.AI_WINS:
+            result_text = "DONKEY CAR WINS!"
+            result_color = (0, 100, 255)
+        else:
+            result_text = "TIE!"
+            result_color = (255, 255, 0)
+        
+        self._draw_sprite((("Result:", (x, y), 0.5, 1, (200, 200, 200)),
+                           (result_text, (x, y + 30), 0.8, 2, result_color)))
+    
+    def _draw_sprite(self, texts):
+        """
+        Draw text lines through the sprite cache
+        
+        Results and gesture names come from a small fixed set, so each
+        combination is rendered once into a tile and copied onto later
+        frames through its mask.
+        
+        Args:
+            texts: Tuple of (text, (x, y), font_scale, thickness, color) lines
+        """
+        cached = self._sprite_cache.get(texts)
+        if cached is None:
+            cached = self._render_sprite(texts)
+            self._sprite_cache[texts] = cached
+        
+        tile, mask, (x0, y0) = cached
+        h, w = tile.shape[:2]
+        np.copyto(self.display_frame[y0:y0 + h, x0:x0 + w], tile, where=mask)
+    
+    def _render_sprite(self, texts):
+        """
+        Rasterize text lines into a tile
+        
+        Args:
+            texts: Tuple of (text, (x, y), font_scale, thickness, color) lines
+        
+        Returns:
+            tuple: (tile, mask, (x0, y0)) - tile and its top-left position
+        """
+        # Bounds of all lines (plus stroke), clipped to the screen
+        font = cv2.FONT_HERSHEY_SIMPLEX
+        x0 = y0 = None
+        x1 = y1 = 0
+        for text, (tx, ty), scale, thickness, _ in texts:
+            (tw, th), baseline = cv2.getTextSize(text, font, scale, thickness)
+            x0 = tx if x0 is None else min(x0, tx)
+            y0 = ty - th - thickness if y0 is None else min(y0, ty - th - thickness)
+            x1 = max(x1, tx + tw + thickness)
+            y1 = max(y1, ty + baseline + thickness)
+        x0 = max(0, x0)
+        y0 = max(0, y0)
+        x1 = min(self.screen_width, x1)
+        y1 = min(self.screen_height, y1)
+        
+        tile = np.zeros((y1 - y0, x1 - x0, 3), dtype=np.uint8)
+        for text, (tx, ty), scale, thickness, color in texts:
+            cv2.putText(tile, text, (tx - x0, ty - y0), font, scale, color, thickness)
+        mask = tile.any(axis=2, keepdims=True)
+        
+        return tile, mask, (x0, y0)
+    
     def _draw_text(self, text, x, y, font_scale=0.5, thickness=1, color=(255, 255, 255)):
         """
         Helper method to draw text on the display